@@ -3,13 +3,15 @@ Google OAuth2 Authentication for AutoRig Online
 """
 import asyncio
 import secrets
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode
 
 import httpx
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from config import (
     GOOGLE_CLIENT_ID,
@@ -34,20 +36,22 @@ GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 # =============================================================================
 # OAuth2 Flow
 # =============================================================================
+# Everything but `state` is fixed for the process, so the query is encoded once.
+_GOOGLE_AUTH_URL_BASE = f"{GOOGLE_AUTH_URL}?" + urlencode({
+    "client_id": GOOGLE_CLIENT_ID,
+    "redirect_uri": GOOGLE_REDIRECT_URI,
+    "response_type": "code",
+    "scope": "openid email profile",
+    "access_type": "offline",
+    "prompt": "consent",
+})
+
+
 def get_google_auth_url(state: Optional[str] = None) -> str:
     """Generate Google OAuth2 authorization URL"""
-    params = {
-        "client_id": GOOGLE_CLIENT_ID,
-        "redirect_uri": GOOGLE_REDIRECT_URI,
-        "response_type": "code",
-        "scope": "openid email profile",
-        "access_type": "offline",
-        "prompt": "consent",
-    }
     if state:
-        params["state"] = state
-    
-    return f"{GOOGLE_AUTH_URL}?{urlencode(params)}"
+        return f"{_GOOGLE_AUTH_URL_BASE}&{urlencode({'state': state})}"
+    return _GOOGLE_AUTH_URL_BASE
 
 
 async def exchange_code_for_tokens(code: str) -> Optional[dict]:
@@ -98,8 +102,8 @@ def generate_session_token() -> str:
     return secrets.token_hex(32)
 
 
-async def create_session(db: AsyncSession, user_id: int, days: int = 30) -> str:
-    """Create a new session for user"""
+async def create_session(db: AsyncSession, user_id: int, days: int = 30, *, commit: bool = True) -> str:
+    """Create a new session for user (``commit=False`` leaves it to the caller's transaction)"""
     token = generate_session_token()
     expires_at = datetime.utcnow() + timedelta(days=days)
     
@@ -109,35 +113,52 @@ async def create_session(db: AsyncSession, user_id: int, days: int = 30) -> str:
         expires_at=expires_at
     )
     db.add(session)
-    await db.commit()
+    if commit:
+        await db.commit()
     
     return token
 
 
+# Session token -> (user_id, session expires_at, cached_until). A hit resolves the user
+# with one primary-key lookup; logout drops the entry and the TTL bounds anything else.
+SESSION_USER_CACHE_TTL_SECONDS = 30.0
+SESSION_USER_CACHE_MAX = 50_000
+_session_user_cache: Dict[str, Tuple[int, datetime, float]] = {}
+
+
 async def get_user_by_session(db: AsyncSession, token: str) -> Optional[User]:
     """Get user by session token"""
     if not token:
         return None
-    
+
+    now = datetime.utcnow()
+    entry = _session_user_cache.get(token)
+    if entry is not None and entry[2] > time.monotonic() and entry[1] > now:
+        return await db.get(User, entry[0])
+
     result = await db.execute(
-        select(Session).where(
+        select(User, Session.expires_at)
+        .join(Session, Session.user_id == User.id)
+        .where(
             Session.token == token,
-            Session.expires_at > datetime.utcnow()
+            Session.expires_at > now
         )
     )
-    session = result.scalar_one_or_none()
-    
-    if not session:
+    row = result.first()
+    if row is None:
+        _session_user_cache.pop(token, None)
         return None
-    
-    result = await db.execute(
-        select(User).where(User.id == session.user_id)
-    )
-    return result.scalar_one_or_none()
+
+    user, expires_at = row
+    if len(_session_user_cache) >= SESSION_USER_CACHE_MAX:
+        _session_user_cache.clear()
+    _session_user_cache[token] = (user.id, expires_at, time.monotonic() + SESSION_USER_CACHE_TTL_SECONDS)
+    return user
 
 
 async def delete_session(db: AsyncSession, token: str):
     """Delete a session (logout)"""
+    _session_user_cache.pop(token, None)
     result = await db.execute(
         select(Session).where(Session.token == token)
     )
@@ -176,8 +197,22 @@ async def apply_pending_gumroad_credits(db: AsyncSession, user: User) -> int:
         purchase.credited = True
         purchase.credits_added = credits
     if total > 0:
-        user.balance_credits = max(0, int(user.balance_credits or 0) + total)
-        user.gumroad_email = user.gumroad_email or user.email
+        # Increment in SQL (like the webhook) so a concurrent webhook credit is not overwritten
+        # by this session's stale balance; mirror the result without marking the user dirty.
+        result = await db.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(
+                balance_credits=func.coalesce(User.balance_credits, 0) + total,
+                gumroad_email=func.coalesce(User.gumroad_email, User.email),
+            )
+            .returning(User.balance_credits, User.gumroad_email)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is not None:
+            set_committed_value(user, "balance_credits", row.balance_credits)
+            set_committed_value(user, "gumroad_email", row.gumroad_email)
         print(f"[Auth] Applied pending Gumroad credits: user={user.email} credits={total}")
     return total
 
@@ -231,20 +266,31 @@ async def get_or_create_user(
 # Anonymous Session Management
 # =============================================================================
 _anon_session_lock = asyncio.Lock()
+# last_seen_at is only used for coarse activity stats; refreshing it at most once
+# a minute keeps repeat anonymous page loads read-only.
+ANON_LAST_SEEN_WRITE_INTERVAL = timedelta(seconds=60)
 
 
 async def get_or_create_anon_session(
     db: AsyncSession, 
-    anon_id: str
+    anon_id: str,
+    *,
+    is_new: bool = False,
 ) -> AnonSession:
-    """Get or create an anonymous session without racing parallel page requests."""
+    """Get or create an anonymous session without racing parallel page requests.
+
+    ``is_new`` marks an id that was just minted for a fresh cookie, so the lookup
+    is skipped and the row is inserted directly.
+    """
     async with _anon_session_lock:
-        result = await db.execute(
-            select(AnonSession).where(AnonSession.anon_id == anon_id)
-        )
-        anon_session = result.scalar_one_or_none()
+        now = datetime.utcnow()
+        anon_session = None
+        if not is_new:
+            result = await db.execute(
+                select(AnonSession).where(AnonSession.anon_id == anon_id)
+            )
+            anon_session = result.scalar_one_or_none()
         if anon_session is None:
-            now = datetime.utcnow()
             anon_session = AnonSession(
                 anon_id=anon_id,
                 free_used=0,
@@ -253,8 +299,13 @@ async def get_or_create_anon_session(
                 registered_as_agent=False,
             )
             db.add(anon_session)
+        elif (
+            anon_session.last_seen_at is not None
+            and now - anon_session.last_seen_at < ANON_LAST_SEEN_WRITE_INTERVAL
+        ):
+            return anon_session
         else:
-            anon_session.last_seen_at = datetime.utcnow()
+            anon_session.last_seen_at = now
         await db.commit()
         return anon_session
 
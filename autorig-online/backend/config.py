@@ -2,6 +2,7 @@
 Configuration for AutoRig Online
 """
 import os
+from functools import lru_cache
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -34,6 +35,11 @@ SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-production-very-secret-key-12
 # Database
 # =============================================================================
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./db/autorig.db")
+# Connection pool for server databases (SQLite uses NullPool/StaticPool instead).
+# Sized for bursts of concurrent task polls + admin/gallery reads on one uvicorn worker.
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "20"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "40"))
+DATABASE_POOL_RECYCLE_SECONDS = int(os.getenv("DATABASE_POOL_RECYCLE_SECONDS", "1800"))
 
 # Canonical animal animation artifacts are runtime data and must stay outside Git.
 ANIMATION_LIBRARY_ROOT = os.getenv(
@@ -87,11 +93,17 @@ ADMIN_EMAILS = [
 _ADMIN_EMAILS_LOWER = frozenset(e.strip().lower() for e in ADMIN_EMAILS)
 
 
+@lru_cache(maxsize=1024)
+def _is_admin_email_cached(email: str) -> bool:
+    return email.strip().lower() in _ADMIN_EMAILS_LOWER
+
+
 def is_admin_email(email: Optional[str]) -> bool:
     """True if email is in ADMIN_EMAILS (case-insensitive)."""
     if not email or not isinstance(email, str):
         return False
-    return email.strip().lower() in _ADMIN_EMAILS_LOWER
+    # Checked on every admin-gated request; the same few addresses repeat.
+    return _is_admin_email_cached(email)
 
 
 # =============================================================================
@@ -129,6 +141,8 @@ PUBLIC_COMPLETED_RIG_BASELINE = int(os.getenv("PUBLIC_COMPLETED_RIG_BASELINE", "
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/var/autorig/uploads")
 UPLOAD_TTL_HOURS = 24
 MAX_UPLOAD_SIZE_MB = 100
+# Read size for worker -> client file/video proxies (bytes per aiter_bytes chunk).
+PROXY_CHUNK_SIZE = int(os.getenv("PROXY_CHUNK_SIZE", str(1024 * 1024)))
 
 # =============================================================================
 # Viewer Defaults (3D viewer settings)
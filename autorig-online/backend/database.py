@@ -14,7 +14,13 @@ from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool, StaticPool
 
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    DATABASE_POOL_SIZE,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_RECYCLE_SECONDS,
+    is_admin_email,
+)
 
 # =============================================================================
 # Engine and Session Setup
@@ -43,6 +49,14 @@ def _create_database_engine(database_url: str):
             connect_args={"check_same_thread": False, "timeout": 30.0},
             poolclass=StaticPool if is_memory_sqlite else NullPool,
         )
+    else:
+        # create_async_engine defaults to AsyncAdaptedQueuePool (5 + 10 overflow).
+        engine_kwargs.update(
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=DATABASE_POOL_RECYCLE_SECONDS,
+        )
     db_engine = create_async_engine(database_url, **engine_kwargs)
     if is_sqlite:
         event.listen(db_engine.sync_engine, "connect", set_sqlite_pragma)
@@ -100,7 +114,6 @@ class User(Base):
     
     @property
     def is_admin(self) -> bool:
-        from config import is_admin_email
         return is_admin_email(self.email)
 
 
@@ -254,6 +267,10 @@ class TaskAnimalAnimationPackPurchase(Base):
 class Task(Base):
     """Conversion task"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # History / owner_tasks pages: WHERE owner_type, owner_id ORDER BY created_at DESC.
+        Index("ix_tasks_owner_created", "owner_type", "owner_id", "created_at"),
+    )
     
     id = Column(String(36), primary_key=True)  # UUID
     owner_type = Column(String(10), nullable=False)  # 'anon' or 'user'
@@ -1082,6 +1099,14 @@ async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+        # create_all does not add indexes to an existing tasks table.
+        try:
+            await conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_tasks_owner_created ON tasks (owner_type, owner_id, created_at)"
+            )
+        except Exception:
+            pass
+
         # Lightweight sqlite "migration" to add new columns without a migration framework.
         # Safe to run repeatedly (errors are ignored when column already exists).
         if "sqlite" in DATABASE_URL:
@@ -10,7 +10,7 @@ import asyncio
 import time
 import math
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Tuple, Set, Callable
+from typing import Optional, List, Dict, Any, Tuple, Set, Callable, AsyncIterator
 import hashlib
 import hmac
 import secrets
@@ -22,12 +22,15 @@ import re
 import html
 from pathlib import Path
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from urllib.parse import urlparse, urlsplit, quote, unquote, parse_qsl, urlencode
 from starlette.background import BackgroundTask
+from starlette.exceptions import HTTPException as StarletteHTTPException
+import orjson
 
 from fastapi import FastAPI, Request, Response, Depends, HTTPException, UploadFile, File, Form, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse, JSONResponse, FileResponse, HTMLResponse, Response
+from fastapi.responses import RedirectResponse, JSONResponse, ORJSONResponse, FileResponse, HTMLResponse, Response
 from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, delete, or_, update, text
@@ -39,7 +42,7 @@ from slowapi.errors import RateLimitExceeded
 from config import (
     APP_NAME, APP_URL, DEBUG, SECRET_KEY,
     DATABASE_URL,
-    UPLOAD_DIR, MAX_UPLOAD_SIZE_MB,
+    UPLOAD_DIR, MAX_UPLOAD_SIZE_MB, PROXY_CHUNK_SIZE,
     RATE_LIMIT_TASKS_PER_MINUTE, RATE_LIMIT_AGENT_REGISTER, is_admin_email,
     ANON_FREE_LIMIT,
     TELEGRAM_BOT_TOKEN, TELEGRAM_BOT_USERNAME,
@@ -136,6 +139,9 @@ from models import (
 )
 from workers import (
     get_global_queue_status,
+    get_worker_base_url,
+    select_best_worker,
+    send_task_to_worker,
     quarantine_worker,
     clear_worker_quarantine,
     is_worker_quarantined,
@@ -154,11 +160,12 @@ from auth import (
 )
 from tasks import (
     create_conversion_task, update_task_progress, start_task_on_worker,
-    get_task_by_id, get_user_tasks,
+    get_task_by_id, get_task_gate_row, get_user_tasks, get_user_tasks_by_user_id,
     get_all_users, update_user_balance,
     get_gallery_items, format_time_ago,
     find_and_reset_stale_tasks,
     find_file_by_pattern,
+    find_quick_download_files,
     get_stalled_processing_tasks_by_worker,
     get_task_no_progress_minutes,
     resolve_prepared_glb_source_url,
@@ -245,19 +252,26 @@ async def get_dispatchable_workers(db: AsyncSession, queue_status, *, allow_quar
     Return workers that are free according to both worker API and backend DB.
     The DB overlay avoids burst dispatch races where several tasks pick the same
     worker before its live /api-converter-glb counters update.
+
+    Sorted once, emptiest first (effective active / max_concurrent), so both the
+    batch dispatch loop and the immediate-dispatch ``[0]`` pick balance load.
+    Each worker takes at most one task per snapshot, so no heap is needed.
     """
     backend_processing = await get_backend_worker_processing_counts(db)
-    return [
-        w
-        for w in (queue_status.workers if queue_status else [])
+    candidates = []
+    for w in (queue_status.workers if queue_status else []):
+        if not w.available:
+            continue
+        effective_active = get_worker_effective_active(w, backend_processing)
         if (
-            w.available
-            and (get_worker_effective_active(w, backend_processing) < w.max_concurrent)
+            effective_active < w.max_concurrent
             and ((w.total_pending or 0) <= 0)
             and (w.queue_size <= 0)
             and (allow_quarantined or not is_worker_quarantined(w.url))
-        )
-    ]
+        ):
+            candidates.append((effective_active / max(w.max_concurrent, 1), len(candidates), w))
+    candidates.sort(key=lambda item: (item[0], item[1]))
+    return [w for _, _, w in candidates]
 
 
 def _pop_preflight_render_image_from_meta(meta: Optional[Dict[str, Any]]) -> Optional[str]:
@@ -499,8 +513,7 @@ def _read_json_file(path: str) -> Optional[dict]:
         p = Path(path)
         if not p.exists():
             return None
-        raw = p.read_text(encoding="utf-8")
-        data = json.loads(raw)
+        data = orjson.loads(p.read_bytes())
         if isinstance(data, dict):
             return data
         return None
@@ -512,12 +525,12 @@ def _read_json_file(path: str) -> Optional[dict]:
 def _atomic_write_json_file(path: str, data: dict) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
-    payload = json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True)
+    payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
     tmp_fd = None
     tmp_path = None
     try:
         tmp_fd, tmp_path = tempfile.mkstemp(prefix=p.name + ".", suffix=".tmp", dir=str(p.parent))
-        with os.fdopen(tmp_fd, "w", encoding="utf-8") as f:
+        with os.fdopen(tmp_fd, "wb") as f:
             f.write(payload)
             f.flush()
             os.fsync(f.fileno())
@@ -678,14 +691,15 @@ async def background_task_updater():
     async def _sync_processing_tasks(db):
         # Keep backend task rows aligned with terminal worker state before stall checks
         # and before dispatch can hand the same worker another queued task.
+        # Only ids and worker_api are needed here; each update reloads its own row.
         result = await db.execute(
-            select(Task).where(Task.status == "processing",
+            select(Task.id, Task.worker_api).where(Task.status == "processing",
                 # a generation task has no worker progress to go stale on;
                 # its own pump owns the lifecycle until the mesh exists
                 Task.pipeline_kind != "generate",
             )
         )
-        processing_tasks = result.scalars().all()
+        processing_tasks = result.all()
 
         if not processing_tasks:
             return
@@ -696,19 +710,27 @@ async def background_task_updater():
         # IMPORTANT: Each task gets its own DB session to avoid SQLAlchemy transaction conflicts.
         semaphore = asyncio.Semaphore(8)
 
-        async def _update_one(task_id: str):
+        async def _update_one(task_id: str, client: httpx.AsyncClient):
             async with semaphore:
                 try:
                     async with AsyncSessionLocal() as task_db:
                         task = await get_task_by_id(task_db, task_id)
                         if task and task.status == "processing":
-                            await update_task_progress(task_db, task)
+                            await update_task_progress(task_db, task, client=client)
                 except Exception as e:
                     print(f"[Background Worker] Error updating task {task_id}: {e}")
 
+        # Workers have no multi-task status endpoint, so group by worker and give each
+        # group one client: that worker's output probes then share keep-alive connections.
+        async def _update_worker_group(task_ids: List[str]):
+            async with httpx.AsyncClient() as client:
+                await asyncio.gather(*[_update_one(tid, client) for tid in task_ids])
+
         # Pass task IDs, not task objects (to get fresh data in each session).
-        task_ids = [t.id for t in processing_tasks]
-        await asyncio.gather(*[_update_one(tid) for tid in task_ids])
+        task_ids_by_worker: Dict[str, List[str]] = {}
+        for t in processing_tasks:
+            task_ids_by_worker.setdefault(t.worker_api or "", []).append(t.id)
+        await asyncio.gather(*[_update_worker_group(ids) for ids in task_ids_by_worker.values()])
     
     while background_task_running:
         try:
@@ -717,6 +739,12 @@ async def background_task_updater():
             async with AsyncSessionLocal() as db:
                 queue_status = None
                 force_stale_reset = False
+                try:
+                    await flush_api_key_last_used(db)
+                except Exception as e:
+                    await db.rollback()
+                    print(f"[Background Worker] API key last_used flush error: {e}")
+
                 # =============================================================
                 # 1. Worker state sync, queue snapshot + stall monitor, then stale reset, then dispatch
                 #    (reset must run before dispatch so tasks moved to "created" post in the same tick)
@@ -964,6 +992,78 @@ async def restart_background_worker(app: FastAPI):
     app.state.background_worker = asyncio.create_task(background_task_updater())
 
 
+# Worker file/video/viewer proxies share one client so keep-alive connections to the
+# workers are reused across requests instead of reconnecting per request.
+PROXY_HTTP_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+
+
+def _proxy_http_client() -> httpx.AsyncClient:
+    """Return the shared proxy client, (re)creating it for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = getattr(app.state, "proxy_http_client", None)
+    if client is None or client.is_closed or getattr(app.state, "proxy_http_client_loop", None) is not loop:
+        client = httpx.AsyncClient(timeout=120.0, limits=PROXY_HTTP_LIMITS)
+        app.state.proxy_http_client = client
+        app.state.proxy_http_client_loop = loop
+    return client
+
+
+# Telegram notices from webhooks go through a bounded queue drained by a few long-lived
+# workers, so a burst cannot pile up unbounded detached tasks.
+TELEGRAM_NOTICE_QUEUE_MAX = 1000
+TELEGRAM_NOTICE_WORKERS = 2
+TELEGRAM_NOTICE_DRAIN_SECONDS = 5.0
+
+
+async def _telegram_notice_worker(queue: "asyncio.Queue") -> None:
+    while True:
+        send, kwargs = await queue.get()
+        try:
+            await send(**kwargs)
+        except Exception as e:
+            print(f"[Telegram] Notice {getattr(send, '__name__', send)} failed: {e}", flush=True)
+        finally:
+            queue.task_done()
+
+
+def _telegram_notice_queue() -> "asyncio.Queue":
+    """Return the notice queue, (re)starting its workers for the running event loop."""
+    loop = asyncio.get_running_loop()
+    queue = getattr(app.state, "telegram_notice_queue", None)
+    if queue is None or getattr(app.state, "telegram_notice_loop", None) is not loop:
+        queue = asyncio.Queue(maxsize=TELEGRAM_NOTICE_QUEUE_MAX)
+        app.state.telegram_notice_queue = queue
+        app.state.telegram_notice_loop = loop
+        app.state.telegram_notice_workers = [
+            asyncio.create_task(_telegram_notice_worker(queue))
+            for _ in range(TELEGRAM_NOTICE_WORKERS)
+        ]
+    return queue
+
+
+def _enqueue_telegram_notice(send: Callable[..., Any], **kwargs: Any) -> None:
+    try:
+        _telegram_notice_queue().put_nowait((send, kwargs))
+    except asyncio.QueueFull:
+        print(f"[Telegram] Notice queue full, dropping {getattr(send, '__name__', send)}", flush=True)
+
+
+async def _stop_telegram_notice_workers() -> None:
+    """Give queued notices a short window to go out, then stop the workers."""
+    queue = getattr(app.state, "telegram_notice_queue", None)
+    if queue is None or getattr(app.state, "telegram_notice_loop", None) is not asyncio.get_running_loop():
+        return
+    try:
+        await asyncio.wait_for(queue.join(), timeout=TELEGRAM_NOTICE_DRAIN_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"[Telegram] Dropping {queue.qsize()} undelivered notice(s) on shutdown", flush=True)
+    workers = app.state.telegram_notice_workers
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    app.state.telegram_notice_queue = None
+
+
 # =============================================================================
 # App Setup
 # =============================================================================
@@ -1037,6 +1137,15 @@ async def lifespan(app: FastAPI):
             await youtube_worker
     except asyncio.CancelledError:
         pass
+    try:
+        async with AsyncSessionLocal() as shutdown_db:
+            await flush_api_key_last_used(shutdown_db)
+    except Exception as e:
+        print(f"[Shutdown] API key last_used flush failed: {e}")
+    await _stop_telegram_notice_workers()
+    proxy_client = getattr(app.state, "proxy_http_client", None)
+    if proxy_client is not None:
+        await proxy_client.aclose()
 
 
 limiter = Limiter(key_func=get_remote_address)
@@ -1045,7 +1154,9 @@ app = FastAPI(
     title=APP_NAME,
     description="Automatic 3D model rigging service",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Dict/model responses are encoded with orjson instead of stdlib json.
+    default_response_class=ORJSONResponse,
 )
 
 # Add GZip compression for responses > 500 bytes.
@@ -1078,7 +1189,7 @@ async def disabled_viewer_feature_guard(request: Request, call_next):
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(request: Request, exc: RateLimitExceeded):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=429,
         content={"error": "Rate limit exceeded. Please try again later."}
     )
@@ -1092,13 +1203,80 @@ SESSION_COOKIE = "session"
 
 _API_KEY_IDENTITY_SENTINEL = object()
 
+# Prefixes of non-revoked API keys, so random/sprayed keys are rejected without a DB query.
+# Keys are only minted in this process (single uvicorn worker); the periodic reload covers
+# revocations and any out-of-band inserts. A superset is fine: the hash check stays authoritative.
+API_KEY_PREFIX_CACHE_TTL_SECONDS = 300.0
+_active_api_key_prefixes: Optional[Set[str]] = None
+_active_api_key_prefixes_loaded_at = 0.0
+
+
+async def _api_key_prefix_may_exist(db: AsyncSession, prefix: str) -> bool:
+    global _active_api_key_prefixes, _active_api_key_prefixes_loaded_at
+    now = time.monotonic()
+    if (
+        _active_api_key_prefixes is None
+        or now - _active_api_key_prefixes_loaded_at > API_KEY_PREFIX_CACHE_TTL_SECONDS
+    ):
+        rs = await db.execute(select(ApiKey.key_prefix).where(ApiKey.revoked_at.is_(None)))
+        _active_api_key_prefixes = set(rs.scalars().all())
+        _active_api_key_prefixes_loaded_at = now
+    return prefix in _active_api_key_prefixes
+
+
+def _remember_api_key_prefix(prefix: str) -> None:
+    if _active_api_key_prefixes is not None:
+        _active_api_key_prefixes.add(prefix)
+
+
+# Recently verified keys: sha256 hex -> (expires_at, key_id, user_id, anon_id). A hit skips
+# the ApiKey SELECT. Revoke/rotate in this process drops entries; the TTL bounds anything else.
+API_KEY_AUTH_CACHE_TTL_SECONDS = 60.0
+API_KEY_AUTH_CACHE_MAX = 10_000
+_api_key_auth_cache: Dict[str, Tuple[float, int, Optional[int], Optional[str]]] = {}
+
+
+def _forget_cached_api_keys(
+    *, key_id: Optional[int] = None, user_id: Optional[int] = None, anon_id: Optional[str] = None
+) -> None:
+    for key_hash, entry in list(_api_key_auth_cache.items()):
+        if (
+            (key_id is not None and entry[1] == key_id)
+            or (user_id is not None and entry[2] == user_id)
+            or (anon_id is not None and entry[3] == anon_id)
+        ):
+            _api_key_auth_cache.pop(key_hash, None)
+
+
+# last_used_at is bookkeeping, not an auth input: verified uses are buffered here and
+# written by the background loop in one UPDATE per cycle instead of a commit per request.
+_pending_api_key_last_used: Dict[int, datetime] = {}
+
+
+async def flush_api_key_last_used(db: AsyncSession) -> int:
+    """Write buffered ApiKey.last_used_at values in one bulk UPDATE; returns keys written."""
+    if not _pending_api_key_last_used:
+        return 0
+    pending = list(_pending_api_key_last_used.items())
+    await db.execute(
+        update(ApiKey),
+        [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending],
+    )
+    await db.commit()
+    # Only drop what was written: a failed flush keeps the batch for the next cycle,
+    # and uses recorded while the UPDATE was in flight stay pending.
+    for key_id, used_at in pending:
+        if _pending_api_key_last_used.get(key_id) == used_at:
+            del _pending_api_key_last_used[key_id]
+    return len(pending)
+
 
 async def resolve_api_key_identity(
     request: Request, db: AsyncSession
 ) -> Tuple[Optional[User], Optional[str]]:
     """
     Parse X-Api-Key / Authorization Bearer, validate against ApiKey rows.
-    Cached per request. Updates last_used_at and commits on success.
+    Cached per request. Marks the key used; the background loop flushes last_used_at.
     Returns (user, anon_id) where at most one of anon_id / user is set for a valid key.
     """
     cached = getattr(request.state, "_api_key_identity_result", _API_KEY_IDENTITY_SENTINEL)
@@ -1115,47 +1293,65 @@ async def resolve_api_key_identity(
         request.state._api_key_identity_result = out
         return out
 
-    prefix = None
-    if api_key.startswith("ar_") and api_key.count("_") >= 2:
-        try:
-            prefix = api_key.split("_", 2)[1]
-        except Exception:
-            prefix = None
-    if not prefix:
+    # ar_<8-char prefix>_<secret>; slice rather than split, the prefix itself may contain "_"
+    if len(api_key) < 12 or not api_key.startswith("ar_") or api_key[11] != "_":
         out = (None, None)
         request.state._api_key_identity_result = out
         return out
+    prefix = api_key[3:11]
 
     key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    entry = _api_key_auth_cache.get(key_hash)
+    if entry is not None:
+        if entry[0] > time.monotonic():
+            _expires_at, cached_key_id, cached_user_id, cached_anon_id = entry
+            _pending_api_key_last_used[cached_key_id] = datetime.utcnow()
+            if cached_user_id is not None:
+                out = (await db.get(User, cached_user_id), None)
+            else:
+                out = (None, cached_anon_id)
+            request.state._api_key_identity_result = out
+            return out
+        _api_key_auth_cache.pop(key_hash, None)
+
+    if not await _api_key_prefix_may_exist(db, prefix):
+        out = (None, None)
+        request.state._api_key_identity_result = out
+        return out
+
+    # Key and owning user in one round trip (outer join: anon keys have no user).
     krs = await db.execute(
-        select(ApiKey).where(
+        select(ApiKey, User)
+        .outerjoin(User, User.id == ApiKey.user_id)
+        .where(
             ApiKey.key_prefix == prefix,
             ApiKey.revoked_at.is_(None),
         )
     )
-    key_rec = krs.scalar_one_or_none()
+    key_row = krs.one_or_none()
+    key_rec, key_user = key_row if key_row is not None else (None, None)
     if not key_rec or not hmac.compare_digest(key_rec.key_hash, key_hash):
         out = (None, None)
         request.state._api_key_identity_result = out
         return out
 
-    key_rec.last_used_at = datetime.utcnow()
+    # Only a verified key is cached and marked used.
+    _pending_api_key_last_used[key_rec.id] = datetime.utcnow()
+    if key_rec.user_id is not None or key_rec.anon_id:
+        if len(_api_key_auth_cache) >= API_KEY_AUTH_CACHE_MAX:
+            _api_key_auth_cache.clear()
+        _api_key_auth_cache[key_hash] = (
+            time.monotonic() + API_KEY_AUTH_CACHE_TTL_SECONDS,
+            key_rec.id,
+            key_rec.user_id,
+            key_rec.anon_id,
+        )
     if key_rec.user_id is not None:
-        urs = await db.execute(select(User).where(User.id == key_rec.user_id))
-        user = urs.scalar_one_or_none()
-        await db.commit()
-        out = (user, None)
-        request.state._api_key_identity_result = out
-        return out
-
-    if key_rec.anon_id:
-        await db.commit()
+        out = (key_user, None)
+    elif key_rec.anon_id:
         out = (None, key_rec.anon_id)
-        request.state._api_key_identity_result = out
-        return out
-
-    await db.commit()
-    out = (None, None)
+    else:
+        out = (None, None)
     request.state._api_key_identity_result = out
     return out
 
@@ -1218,18 +1414,18 @@ async def get_anon_session(
         return await get_or_create_anon_session(db, anon_from_key)
 
     anon_id = request.cookies.get(ANON_COOKIE)
+    if anon_id:
+        return await get_or_create_anon_session(db, anon_id)
 
-    if not anon_id:
-        anon_id = str(uuid.uuid4())
-        response.set_cookie(
-            ANON_COOKIE,
-            anon_id,
-            max_age=365 * 24 * 60 * 60,  # 1 year
-            httponly=True,
-            samesite="lax",
-        )
-
-    return await get_or_create_anon_session(db, anon_id)
+    anon_id = uuid.uuid4().hex
+    response.set_cookie(
+        ANON_COOKIE,
+        anon_id,
+        max_age=365 * 24 * 60 * 60,  # 1 year
+        httponly=True,
+        samesite="lax",
+    )
+    return await get_or_create_anon_session(db, anon_id, is_new=True)
 
 
 async def require_admin(
@@ -1264,8 +1460,8 @@ def _validate_viewer_settings_payload(body_bytes: bytes) -> dict:
     if len(body_bytes) > max_bytes:
         raise HTTPException(status_code=413, detail="Viewer settings payload too large")
     try:
-        data = json.loads(body_bytes.decode("utf-8") if isinstance(body_bytes, (bytes, bytearray)) else body_bytes)
-    except Exception:
+        data = orjson.loads(body_bytes)
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON")
     if not isinstance(data, dict):
         raise HTTPException(status_code=400, detail="Viewer settings must be a JSON object")
@@ -1325,12 +1521,19 @@ def _read_global_viewer_camera_preset() -> Optional[Dict[str, Any]]:
     return None
 
 
+def _owner_id_matches(owner_id: Optional[str], candidate: Optional[str]) -> bool:
+    """Constant-time owner check; anon ids act as bearer tokens."""
+    if not owner_id or not candidate:
+        return False
+    return hmac.compare_digest(owner_id.encode("utf-8"), candidate.encode("utf-8"))
+
+
 def _is_task_owner_or_admin(*, task, user: Optional[User], anon_session: Optional[AnonSession]) -> bool:
     if user and is_admin_email(user.email):
         return True
-    if user and task.owner_type == "user" and task.owner_id == user.email:
+    if user and task.owner_type == "user" and _owner_id_matches(task.owner_id, user.email):
         return True
-    if anon_session and task.owner_type == "anon" and task.owner_id == anon_session.anon_id:
+    if anon_session and task.owner_type == "anon" and _owner_id_matches(task.owner_id, anon_session.anon_id):
         return True
     return False
 
@@ -1338,10 +1541,9 @@ def _is_task_owner_or_admin(*, task, user: Optional[User], anon_session: Optiona
 def _can_download_task(*, task: Task, user: Optional[User], request: Request) -> bool:
     if user and is_admin_email(user.email):
         return True
-    if user and task.owner_type == "user" and task.owner_id == user.email:
+    if user and task.owner_type == "user" and _owner_id_matches(task.owner_id, user.email):
         return True
-    anon_id = _effective_anon_id(request)
-    return bool(task.owner_type == "anon" and anon_id and task.owner_id == anon_id)
+    return task.owner_type == "anon" and _owner_id_matches(task.owner_id, _effective_anon_id(request))
 
 
 def _require_task_download_access(*, task: Task, user: Optional[User], request: Request) -> None:
@@ -1603,8 +1805,6 @@ def _derive_legacy_animations_glb_url(task) -> Optional[str]:
     except (ValueError, TypeError, AttributeError):
         return None
 
-    from workers import get_worker_base_url
-
     worker_base = str(get_worker_base_url(worker_api) or "").strip()
     try:
         parsed = urlsplit(worker_base)
@@ -1669,7 +1869,6 @@ def _resolve_all_animations_fbx_url(task) -> tuple[Optional[str], Optional[str]]
     if not task.guid or not task.worker_api:
         return None, None
 
-    from workers import get_worker_base_url
     worker_base = get_worker_base_url(task.worker_api)
     filename = f"{task.guid}_all_animations_unity.fbx"
     return (
@@ -2094,8 +2293,7 @@ async def _fetch_worker_model_files(task: Task) -> Tuple[bool, List[Dict[str, An
     files_url = f"{api_base}/api-converter-glb/model-files/{guid}"
 
     try:
-        async with httpx.AsyncClient(timeout=6.0, follow_redirects=True) as client:
-            resp = await client.get(files_url)
+        resp = await _proxy_http_client().get(files_url, timeout=6.0, follow_redirects=True)
         if resp.status_code != 200:
             return False, [], {}, f"HTTP {resp.status_code}"
         data = resp.json() if resp.content else {}
@@ -2350,6 +2548,8 @@ async def _claim_anonymous_task_for_user(
     task_id: Optional[str],
     anon_id: Optional[str],
     user_email: Optional[str],
+    *,
+    commit: bool = True,
 ) -> bool:
     """Transfer the task opened before Google OAuth to the signed-in user."""
     task_id = str(task_id or "").strip()
@@ -2367,17 +2567,44 @@ async def _claim_anonymous_task_for_user(
         )
         .values(owner_type="user", owner_id=user_email)
     )
-    await db.commit()
+    if commit:
+        await db.commit()
     return bool(result.rowcount)
 
 
+AUTH_STATE_COOKIE = "auth_state"
+
+
+def _auth_state_mac(state: str) -> str:
+    return hmac.new(SECRET_KEY.encode("utf-8"), state.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+def _verify_auth_state(state: Optional[str], cookie_value: Optional[str]) -> bool:
+    """Check the OAuth `state` against the signed cookie set by /auth/login."""
+    if not state or not cookie_value:
+        return False
+    cookie_state, _, mac = cookie_value.rpartition(".")
+    if not cookie_state or not hmac.compare_digest(mac, _auth_state_mac(cookie_state)):
+        return False
+    return hmac.compare_digest(cookie_state, state)
+
+
 @app.get("/auth/login")
 async def auth_login(request: Request, next: Optional[str] = None):
     """Redirect to Google OAuth"""
-    state = str(uuid.uuid4())
+    state = uuid.uuid4().hex
     auth_url = get_google_auth_url(state)
     
     response = RedirectResponse(url=auth_url)
+    # State round-trips in a signed cookie, so the callback needs no server-side lookup
+    response.set_cookie(
+        AUTH_STATE_COOKIE,
+        f"{state}.{_auth_state_mac(state)}",
+        max_age=300,
+        httponly=True,
+        secure=True,
+        samesite="lax",
+    )
     # Save return URL in cookie (max 5 minutes) for redirect after OAuth
     if next and next.startswith("/"):  # Security: only allow relative URLs
         response.set_cookie("auth_next", next, max_age=300, httponly=True, samesite="lax")
@@ -2389,6 +2616,7 @@ async def auth_callback(
     request: Request,
     response: Response,
     code: Optional[str] = None,
+    state: Optional[str] = None,
     error: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
@@ -2398,15 +2626,28 @@ async def auth_callback(
     
     if not code:
         return RedirectResponse(url="/?error=no_code")
+
+    if not _verify_auth_state(state, request.cookies.get(AUTH_STATE_COOKIE)):
+        return RedirectResponse(url="/?error=invalid_state")
     
     # Exchange code for tokens
     tokens = await exchange_code_for_tokens(code)
     if not tokens:
         return RedirectResponse(url="/?error=token_exchange_failed")
     
-    # Get user info
+    # Get user info; the anon session (for credit transfer) is loaded while
+    # the Google user-info request is in flight. It is only read here: a missing
+    # row means no free credits were used, so there is nothing to create.
     access_token = tokens.get("access_token")
-    user_info = await get_google_user_info(access_token)
+    anon_id = request.cookies.get(ANON_COOKIE)
+    if anon_id:
+        user_info, anon_session = await asyncio.gather(
+            get_google_user_info(access_token),
+            db.get(AnonSession, anon_id),
+        )
+    else:
+        user_info = await get_google_user_info(access_token)
+        anon_session = None
     if not user_info:
         return RedirectResponse(url="/?error=user_info_failed")
     
@@ -2414,12 +2655,6 @@ async def auth_callback(
     if not email:
         return RedirectResponse(url="/?error=no_email")
     
-    # Get anon session for credit transfer
-    anon_id = request.cookies.get(ANON_COOKIE)
-    anon_session = None
-    if anon_id:
-        anon_session = await get_or_create_anon_session(db, anon_id)
-    
     # Get or create user
     user = await get_or_create_user(
         db,
@@ -2433,10 +2668,11 @@ async def auth_callback(
     if not next_url.startswith("/"):
         next_url = "/"
     next_task_id = dict(parse_qsl(urlparse(next_url).query)).get("id")
-    await _claim_anonymous_task_for_user(db, next_task_id, anon_id, user.email)
 
-    # Create session
-    session_token = await create_session(db, user.id)
+    # Create session and claim the pending anon task in one commit
+    session_token = await create_session(db, user.id, commit=False)
+    await _claim_anonymous_task_for_user(db, next_task_id, anon_id, user.email, commit=False)
+    await db.commit()
     
     # Set session cookie and redirect to original page
     redirect = RedirectResponse(url=next_url, status_code=302)
@@ -2448,8 +2684,9 @@ async def auth_callback(
         secure=True,
         samesite="lax"
     )
-    # Clean up auth_next cookie
+    # Clean up auth_next / auth_state cookies
     redirect.delete_cookie("auth_next")
+    redirect.delete_cookie(AUTH_STATE_COOKIE)
     
     return redirect
 
@@ -2547,6 +2784,14 @@ async def auth_logout(
     return response
 
 
+# Same shape as AuthStatusResponse(authenticated=False, anon=AnonInfo(...)).
+AUTH_ME_ANON_JSON_TEMPLATE = (
+    b'{"authenticated":false,"user":null,'
+    b'"anon":{"anon_id":%s,"free_used":%d,"free_remaining":%d},'
+    b'"credits_remaining":%d,"login_required":false}'
+)
+
+
 @app.get("/auth/me", response_model=AuthStatusResponse)
 async def auth_me(
     request: Request,
@@ -2573,20 +2818,21 @@ async def auth_me(
             login_required=False
         )
     
-    # Anonymous user
+    # Anonymous user: the hottest /auth/me path, rendered from a fixed template
+    # instead of building and validating the pydantic response model.
     anon_session = await get_anon_session(request, response, db)
     remaining = get_remaining_credits_anon(anon_session)
-    
-    return AuthStatusResponse(
-        authenticated=False,
-        anon=AnonInfo(
-            anon_id=anon_session.anon_id,
-            free_used=anon_session.free_used,
-            free_remaining=remaining
-        ),
-        credits_remaining=remaining,
-        login_required=False
+    body = AUTH_ME_ANON_JSON_TEMPLATE % (
+        json.dumps(anon_session.anon_id).encode("utf-8"),
+        int(anon_session.free_used or 0),
+        remaining,
+        remaining,
     )
+    out = Response(content=body, media_type="application/json")
+    # Returning a Response bypasses FastAPI's merge of the injected response,
+    # so carry over the anon cookie set by get_anon_session.
+    out.raw_headers.extend(h for h in response.raw_headers if h[0] == b"set-cookie")
+    return out
 
 
 @app.patch("/api/user/notification-settings", response_model=UserInfo)
@@ -2929,13 +3175,18 @@ def _make_api_key() -> tuple[str, str, str]:
     Returns (api_key_plain, prefix, sha256_hex_hash).
     api_key format: ar_<prefix>_<secret>
     """
-    secret = secrets.token_urlsafe(32)
+    secret = base64.urlsafe_b64encode(secrets.token_bytes(32)).rstrip(b"=").decode("ascii")
     prefix = secret[:8]
     api_key = f"ar_{prefix}_{secret}"
-    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    # Hash covers the full key string so existing stored hashes keep verifying.
+    key_hash = hashlib.sha256(api_key.encode("ascii")).hexdigest()
     return api_key, prefix, key_hash
 
 
+# Newest keys only; older revoked keys are history nobody pages through.
+API_KEY_LIST_LIMIT = 50
+
+
 @app.get("/api/user/api-keys", response_model=ApiKeyListResponse)
 async def api_list_api_keys(
     request: Request,
@@ -2943,12 +3194,15 @@ async def api_list_api_keys(
     db: AsyncSession = Depends(get_db)
 ):
     if user:
-        rs = await db.execute(select(ApiKey).where(ApiKey.user_id == user.id).order_by(ApiKey.created_at.desc()))
+        owner_filter = ApiKey.user_id == user.id
     else:
         anon_id = request.cookies.get(ANON_COOKIE)
         if not anon_id:
             raise HTTPException(status_code=401, detail="Authentication required")
-        rs = await db.execute(select(ApiKey).where(ApiKey.anon_id == anon_id).order_by(ApiKey.created_at.desc()))
+        owner_filter = ApiKey.anon_id == anon_id
+    rs = await db.execute(
+        select(ApiKey).where(owner_filter).order_by(ApiKey.created_at.desc()).limit(API_KEY_LIST_LIMIT)
+    )
     keys = rs.scalars().all()
     return ApiKeyListResponse(
         keys=[
@@ -2971,20 +3225,19 @@ async def api_create_api_key(
     db: AsyncSession = Depends(get_db)
 ):
     if user:
-        rs = await db.execute(
-            select(ApiKey).where(ApiKey.user_id == user.id, ApiKey.revoked_at.is_(None))
-        )
+        owner_filter = ApiKey.user_id == user.id
     else:
         anon_id = request.cookies.get(ANON_COOKIE)
         if not anon_id:
             raise HTTPException(status_code=401, detail="Authentication required")
-        rs = await db.execute(
-            select(ApiKey).where(ApiKey.anon_id == anon_id, ApiKey.revoked_at.is_(None))
-        )
-    active = rs.scalars().all()
-    now = datetime.utcnow()
-    for k in active:
-        k.revoked_at = now
+        owner_filter = ApiKey.anon_id == anon_id
+    # Revoke all active keys in one UPDATE instead of loading them as ORM rows.
+    await db.execute(
+        update(ApiKey)
+        .where(owner_filter, ApiKey.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
 
     api_key, prefix, key_hash = _make_api_key()
     if user:
@@ -2993,6 +3246,11 @@ async def api_create_api_key(
         rec = ApiKey(user_id=None, anon_id=anon_id, key_prefix=prefix, key_hash=key_hash)
     db.add(rec)
     await db.commit()
+    if user:
+        _forget_cached_api_keys(user_id=user.id)
+    else:
+        _forget_cached_api_keys(anon_id=anon_id)
+    _remember_api_key_prefix(prefix)
     await db.refresh(rec)
 
     return ApiKeyCreateResponse(
@@ -3027,6 +3285,7 @@ async def api_revoke_api_key(
     if rec.revoked_at is None:
         rec.revoked_at = datetime.utcnow()
         await db.commit()
+    _forget_cached_api_keys(key_id=key_id)
     return {"ok": True, "key_id": key_id}
 
 
@@ -3046,7 +3305,7 @@ async def api_agents_register(
     body: AgentRegisterRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    anon_id = str(uuid.uuid4())
+    anon_id = uuid.uuid4().hex
     name = (body.name or "").strip() or None
     desc = (body.description or "").strip() or None
     sess = AnonSession(
@@ -3059,6 +3318,7 @@ async def api_agents_register(
     api_key, prefix, key_hash = _make_api_key()
     db.add(ApiKey(user_id=None, anon_id=anon_id, key_prefix=prefix, key_hash=key_hash))
     await db.commit()
+    _remember_api_key_prefix(prefix)
     return AgentRegisterResponse(api_key=api_key, agent_id=anon_id)
 
 
@@ -4078,19 +4338,28 @@ async def api_create_task(
         await ensure_request_disk_headroom(db, context="task_create_upload")
         disk_headroom_checked = True
 
+        # Multipart parsing already knows the part size; reject before touching disk.
+        if file.size is not None and file.size > MAX_UPLOAD_SIZE_MB * 1024 * 1024:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_MB}MB."
+            )
+
         # Save uploaded file
-        upload_token = str(uuid.uuid4())
+        upload_token = uuid.uuid4().hex
         upload_dir = os.path.join(UPLOAD_DIR, upload_token)
-        os.makedirs(upload_dir, exist_ok=True)
+        await asyncio.to_thread(os.makedirs, upload_dir, exist_ok=True)
         
         filename = file.filename or "model.glb"
         filepath = os.path.join(upload_dir, filename)
         
-        # Stream upload to disk so large files do not spike RAM.
+        # Stream upload to disk so large files do not spike RAM; disk writes run
+        # in a thread so slow volumes do not stall the event loop.
         max_upload_bytes = MAX_UPLOAD_SIZE_MB * 1024 * 1024
         uploaded_bytes = 0
         try:
-            with open(filepath, "wb") as f:
+            f = await asyncio.to_thread(open, filepath, "wb")
+            try:
                 while True:
                     chunk = await file.read(1024 * 1024)
                     if not chunk:
@@ -4101,10 +4370,12 @@ async def api_create_task(
                             status_code=413,
                             detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE_MB}MB."
                         )
-                    f.write(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
         except Exception:
             try:
-                os.unlink(filepath)
+                await asyncio.to_thread(os.unlink, filepath)
             except OSError:
                 pass
             raise
@@ -4225,9 +4496,11 @@ async def api_create_task(
             {"source": source, "type": input_type, "pipeline": pipeline},
         ))
     
-    # Try to dispatch immediately to a free worker (don't wait for background cycle)
+    # Try to dispatch immediately to a free worker (don't wait for background cycle).
+    # A snapshot up to QUEUE_STATUS_CACHE_TTL_SECONDS old is fine: get_dispatchable_workers
+    # overlays the DB processing counts, and the background cycle retries anything missed.
     try:
-        queue_status = await get_global_queue_status(db=db)
+        queue_status = await _cached_global_queue_status()
         free_workers = await get_dispatchable_workers(db, queue_status)
         free_worker = free_workers[0] if free_workers else None
         if free_worker:
@@ -4888,8 +5161,8 @@ async def api_create_convert_from_rig_task(
     anon_session = await get_anon_session(request, response, db)
     is_admin = bool(user and is_admin_email(user.email))
     is_owner = (
-        (user and parent.owner_type == "user" and parent.owner_id == user.email)
-        or (parent.owner_type == "anon" and parent.owner_id == anon_session.anon_id)
+        (user and parent.owner_type == "user" and _owner_id_matches(parent.owner_id, user.email))
+        or (parent.owner_type == "anon" and _owner_id_matches(parent.owner_id, anon_session.anon_id))
     )
     if not (is_owner or is_admin):
         raise HTTPException(status_code=403, detail="Not authorized to use this task")
@@ -4931,7 +5204,7 @@ async def api_create_convert_from_rig_task(
         raise HTTPException(status_code=500, detail=error)
 
     try:
-        queue_status = await get_global_queue_status(db=db)
+        queue_status = await _cached_global_queue_status()
         free_workers = await get_dispatchable_workers(db, queue_status)
         free_worker = free_workers[0] if free_workers else None
         if free_worker:
@@ -4966,6 +5239,8 @@ async def api_gumroad_ping_check():
 GUMROAD_PROXY_TARGET = "https://free3d.online/gumroad/ping"
 
 
+# Gumroad retries a sale with the same permalink, so the parse is memoized.
+@lru_cache(maxsize=512)
 def _normalize_gumroad_product_key(raw_value: str | None) -> str:
     value = (raw_value or "").strip()
     if not value:
@@ -4981,6 +5256,9 @@ def _normalize_gumroad_product_key(raw_value: str | None) -> str:
     return value.strip().lower()
 
 
+_GUMROAD_KNOWN_PRODUCT_KEYS = frozenset(str(k).strip().lower() for k in GUMROAD_PRODUCT_CREDITS)
+
+
 def _gumroad_product_key_from_payload(product: str | None, product_name: str | None) -> str:
     product_key = _normalize_gumroad_product_key(product)
     if product_key in GUMROAD_PRODUCT_CREDITS:
@@ -5021,6 +5299,23 @@ def _gumroad_credit_target_email(parsed_form: Dict[str, Any]) -> str:
     return _gumroad_clean_email(parsed_form.get("email")) or "unknown"
 
 
+async def _insert_gumroad_purchase_if_new(db: AsyncSession, **values: Any) -> bool:
+    """
+    INSERT the webhook audit row unless sale_id already exists (ON CONFLICT DO NOTHING).
+    Returns False for a duplicate delivery, without a failed INSERT/rollback round trip.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    result = await db.execute(
+        dialect_insert(GumroadPurchase)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[GumroadPurchase.sale_id])
+    )
+    return bool(result.rowcount)
+
+
 def _is_autorig_credit_product(product_key: str) -> bool:
     return (product_key or "").strip().lower() in AUTORIG_DONATION_PRODUCT_KEYS
 
@@ -5064,47 +5359,53 @@ async def api_gumroad_ping(
     local_credits_added = 0
     is_plugin_product = _is_blender_plugin_product(product_key, product_name)
     known_product = (
-        product_key in {str(k).strip().lower() for k in GUMROAD_PRODUCT_CREDITS.keys()}
+        product_key in _GUMROAD_KNOWN_PRODUCT_KEYS
         or is_plugin_product
     )
     should_notify_purchase = False
+    purchase_values = dict(
+        sale_id=sale_id,
+        product_permalink=product_key,
+        product_name=product_name,
+        price=price_cents,
+        refunded=refunded,
+        is_recurring_charge=is_recurring_charge,
+        subscription_id=subscription_id,
+        license_key=license_key,
+        test=is_test,
+        raw_payload=raw_body.decode("utf-8", errors="ignore"),
+        credited=False,
+        credits_added=0,
+    )
 
     if _is_autorig_credit_product(product_key) and email and email != "unknown":
         try:
             async with AsyncSessionLocal() as db:
-                purchase = GumroadPurchase(
-                    sale_id=sale_id,
-                    email=email,
-                    product_permalink=product_key,
-                    product_name=product_name,
-                    price=price_cents,
-                    refunded=refunded,
-                    is_recurring_charge=is_recurring_charge,
-                    subscription_id=subscription_id,
-                    license_key=license_key,
-                    test=is_test,
-                    raw_payload=raw_body.decode("utf-8", errors="ignore"),
-                    credited=False,
-                    credits_added=0,
-                )
-                db.add(purchase)
-                try:
-                    await db.flush()
-                except IntegrityError:
-                    await db.rollback()
-                    purchase = None
-
-                if purchase is not None:
+                if await _insert_gumroad_purchase_if_new(db, email=email, **purchase_values):
                     credits_to_add = 0 if refunded else int(GUMROAD_PRODUCT_CREDITS.get(product_key, max(price_cents, 0)))
-                    user_result = await db.execute(
-                        select(User).where(func.lower(User.email) == email.lower())
-                    )
-                    user = user_result.scalar_one_or_none()
-                    if user and credits_to_add > 0:
-                        user.balance_credits = max(0, int(user.balance_credits or 0) + credits_to_add)
-                        user.gumroad_email = checkout_email if checkout_email != "unknown" else email
-                        purchase.credited = True
-                        purchase.credits_added = credits_to_add
+                    user = None
+                    if credits_to_add > 0:
+                        # Atomic increment: concurrent webhooks for one buyer must not lose credits.
+                        user_result = await db.execute(
+                            select(User)
+                            .from_statement(
+                                update(User)
+                                .where(func.lower(User.email) == email.lower())
+                                .values(
+                                    balance_credits=func.coalesce(User.balance_credits, 0) + credits_to_add,
+                                    gumroad_email=checkout_email if checkout_email != "unknown" else email,
+                                )
+                                .returning(User)
+                            )
+                            .execution_options(populate_existing=True)
+                        )
+                        user = user_result.scalar_one_or_none()
+                    if user:
+                        await db.execute(
+                            update(GumroadPurchase)
+                            .where(GumroadPurchase.sale_id == sale_id)
+                            .values(credited=True, credits_added=credits_to_add)
+                        )
                         local_credits_added = credits_to_add
                         auto_unlock = await _try_auto_unlock_pending_checkout(db, user, sale_id)
                         if auto_unlock:
@@ -5122,28 +5423,9 @@ async def api_gumroad_ping(
     if is_plugin_product:
         try:
             async with AsyncSessionLocal() as db:
-                purchase = GumroadPurchase(
-                    sale_id=sale_id,
-                    email=email or "unknown",
-                    product_permalink=product_key,
-                    product_name=product_name,
-                    price=price_cents,
-                    refunded=refunded,
-                    is_recurring_charge=is_recurring_charge,
-                    subscription_id=subscription_id,
-                    license_key=license_key,
-                    test=is_test,
-                    raw_payload=raw_body.decode("utf-8", errors="ignore"),
-                    credited=False,
-                    credits_added=0,
-                )
-                db.add(purchase)
-                try:
-                    await db.flush()
+                if await _insert_gumroad_purchase_if_new(db, email=email or "unknown", **purchase_values):
                     await db.commit()
                     should_notify_purchase = True
-                except IntegrityError:
-                    await db.rollback()
         except Exception as e:
             print(f"[Gumroad] Plugin purchase audit failed for {sale_id}: {e}", flush=True)
 
@@ -5163,19 +5445,18 @@ async def api_gumroad_ping(
         notice_package = (
             f"Blender Plugin ABCD {notice_price}" if is_plugin_product else _checkout_pack_label(product_key)
         )
-        asyncio.create_task(
-            broadcast_credits_purchased(
-                credits=0 if is_plugin_product else (local_credits_added if local_credits_added > 0 else max(price_cents, 0)),
-                price=notice_price,
-                user_email=email,
-                product=product_key or product,
-                sale_id=sale_id,
-                is_test=is_test,
-                is_recurring_charge=is_recurring_charge,
-                refunded=refunded,
-                product_kind=notice_kind,
-                package=notice_package,
-            )
+        _enqueue_telegram_notice(
+            broadcast_credits_purchased,
+            credits=0 if is_plugin_product else (local_credits_added if local_credits_added > 0 else max(price_cents, 0)),
+            price=notice_price,
+            user_email=email,
+            product=product_key or product,
+            sale_id=sale_id,
+            is_test=is_test,
+            is_recurring_charge=is_recurring_charge,
+            refunded=refunded,
+            product_kind=notice_kind,
+            package=notice_package,
         )
 
     try:
@@ -5194,22 +5475,18 @@ async def api_gumroad_ping(
 
 
 def _task_prepared_glb_ready(task: Task) -> bool:
-    """Whether either a private viewer GLB or the legacy prepared GLB is declared."""
+    """Whether either a private viewer GLB or the legacy prepared GLB is declared.
+
+    The cache-file check opens the GLB, so it runs only when nothing cheaper matched.
+    """
+    if str(getattr(task, "viewer_prepared_glb_url", None) or "").strip():
+        return True
+    if getattr(task, "fbx_glb_ready", False):
+        return True
+    if any("_model_prepared.glb" in str(url or "").lower() for url in (task.ready_urls or [])):
+        return True
     optimized_cache = GLB_CACHE_DIR / f"{task.id}_prepared_viewer.glb"
-    optimized_cache_ready = optimized_cache.exists() and _validate_glb_file(optimized_cache)
-    optimized_url_ready = bool(
-        str(getattr(task, "viewer_prepared_glb_url", None) or "").strip()
-    )
-    legacy_ready = any(
-        "_model_prepared.glb" in str(url or "").lower()
-        for url in (task.ready_urls or [])
-    )
-    return bool(
-        optimized_cache_ready
-        or optimized_url_ready
-        or legacy_ready
-        or getattr(task, "fbx_glb_ready", False)
-    )
+    return bool(optimized_cache.exists() and _validate_glb_file(optimized_cache))
 
 def _downloadable_task_counts(
     task: Task,
@@ -5226,6 +5503,28 @@ def _downloadable_task_counts(
     return ready_count, total_count
 
 
+# Every open tab polls its task each second: concurrent polls of one task share the
+# leader's worker refresh and then just re-read the row it committed.
+_task_progress_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+async def _update_task_progress_single_flight(db: AsyncSession, task: Task) -> Task:
+    waiter = _task_progress_inflight.get(task.id)
+    if waiter is not None:
+        # shield: a follower that disconnects must not cancel the others' wait.
+        await asyncio.shield(waiter)
+        await db.refresh(task)
+        return task
+    waiter = asyncio.get_running_loop().create_future()
+    _task_progress_inflight[task.id] = waiter
+    try:
+        return await update_task_progress(db, task)
+    finally:
+        _task_progress_inflight.pop(task.id, None)
+        if not waiter.done():
+            waiter.set_result(None)
+
+
 @app.get("/api/task/{task_id}", response_model=TaskStatusResponse)
 async def api_get_task(
     task_id: str,
@@ -5242,10 +5541,10 @@ async def api_get_task(
     
     # Update progress if still processing, or check video for done tasks
     if task.status == "processing":
-        task = await update_task_progress(db, task)
+        task = await _update_task_progress_single_flight(db, task)
     elif task.status == "done" and not task.video_ready:
         # Check video availability for completed tasks
-        task = await update_task_progress(db, task)
+        task = await _update_task_progress_single_flight(db, task)
 
     if (
         task.status == "done"
@@ -5259,43 +5558,9 @@ async def api_get_task(
     if _task_needs_poster_classification(task):
         _schedule_poster_recovery_throttled(task.id)
     
-    # Find viewer HTML file (_100k .html)
-    viewer_html_url = None
-    if task.ready_urls:
-        viewer_html_url = find_file_by_pattern(task.ready_urls, ".html", "100k")
-    
-    # Find quick download files
-    quick_downloads = {}
-    if task.ready_urls:
-        # 3ds Max
-        max_url = find_file_by_pattern(task.ready_urls, ".max", "100k")
-        if max_url:
-            quick_downloads["max"] = max_url
-        
-        # Maya
-        maya_url = find_file_by_pattern(task.ready_urls, ".ma", "100k")
-        if maya_url:
-            quick_downloads["maya"] = maya_url
-        
-        # Cinema 4D
-        c4d_url = find_file_by_pattern(task.ready_urls, ".c4d", "100k")
-        if c4d_url:
-            quick_downloads["cinema4d"] = c4d_url
-        
-        # Unity HDRP
-        unity_hdrp_url = find_file_by_pattern(task.ready_urls, ".hdrp.unitypackage", "100k")
-        if unity_hdrp_url:
-            quick_downloads["unity_hdrp"] = unity_hdrp_url
-        
-        # Unity Standard (if different from HDRP)
-        unity_url = find_file_by_pattern(task.ready_urls, ".unitypackage", "100k")
-        if unity_url and unity_url != unity_hdrp_url:
-            quick_downloads["unity"] = unity_url
-        
-        # Unreal Engine (FBX)
-        unreal_url = find_file_by_pattern(task.ready_urls, ".fbx", "100k")
-        if unreal_url:
-            quick_downloads["unreal"] = unreal_url
+    # Viewer HTML and quick download files (_100k, falling back to 10k/1k) in one pass
+    quick_downloads = find_quick_download_files(task.ready_urls or [], "100k")
+    viewer_html_url = quick_downloads.pop("viewer_html", None)
     
     # prepared.glb ready if:
     # - _model_prepared.glb exists in ready_urls (worker uploaded it)
@@ -5310,7 +5575,6 @@ async def api_get_task(
         if not raw:
             return None
         try:
-            import json
             data = json.loads(raw)
             if isinstance(data, list):
                 out = [str(x).strip() for x in data if str(x).strip()]
@@ -5436,7 +5700,7 @@ async def api_get_task(
         progress_page=task.progress_page if can_download_task else None,
         worker_api=worker_api_for_response,
         viewer_html_url=viewer_html_url if can_download_task else None,
-        quick_downloads=(quick_downloads if quick_downloads else None) if can_download_task else None,
+        quick_downloads=(quick_downloads or None) if can_download_task else None,
         prepared_glb_ready=prepared_glb_ready,
         error_message=task.error_message,
         guid=task.guid if can_download_task else None,
@@ -5460,6 +5724,114 @@ async def api_get_task(
     )
 
 
+# Progress-log and worker-file polls repeat every few seconds per open tab: worker
+# responses are reused briefly and concurrent misses share one in-flight fetch.
+WORKER_POLL_CACHE_TTL_SECONDS = 1.0
+WORKER_POLL_CACHE_MAX = 4096
+_worker_poll_cache: Dict[Any, Tuple[float, Any]] = {}
+_worker_poll_inflight: Dict[Any, "asyncio.Future"] = {}
+
+
+def _store_worker_poll(key: Any, fut: "asyncio.Future") -> None:
+    _worker_poll_inflight.pop(key, None)
+    if fut.cancelled() or fut.exception() is not None:
+        return
+    now = time.monotonic()
+    # Entries live about a second, so pruning on every store keeps the dict to the
+    # tasks polled just now instead of holding finished tasks' logs until the cap.
+    for stale_key in [k for k, (expires, _value) in _worker_poll_cache.items() if expires <= now]:
+        del _worker_poll_cache[stale_key]
+    if len(_worker_poll_cache) >= WORKER_POLL_CACHE_MAX:
+        _worker_poll_cache.clear()
+    _worker_poll_cache[key] = (now + WORKER_POLL_CACHE_TTL_SECONDS, fut.result())
+
+
+async def _cached_worker_poll(key: Any, fetch: Callable[[], Any]) -> Any:
+    entry = _worker_poll_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    inflight = _worker_poll_inflight.get(key)
+    if inflight is None:
+        inflight = asyncio.ensure_future(fetch())
+        _worker_poll_inflight[key] = inflight
+        inflight.add_done_callback(lambda fut, key=key: _store_worker_poll(key, fut))
+    # shield: a disconnecting poller must not cancel the fetch other callers await.
+    return await asyncio.shield(inflight)
+
+
+# Last log body per URL with its validators, so unchanged logs of running tasks come
+# back as 304s. Bounded by total size; large logs are fetched plainly instead.
+PROGRESS_LOG_CACHE_BODY_MAX_BYTES = 256 * 1024
+PROGRESS_LOG_CACHE_TOTAL_MAX_BYTES = 32 * 1024 * 1024
+_progress_log_validators: Dict[str, Tuple[Optional[str], Optional[str], str, int]] = {}
+_progress_log_cached_bytes = 0
+
+
+def _forget_progress_log(log_url: str) -> None:
+    global _progress_log_cached_bytes
+    entry = _progress_log_validators.pop(log_url, None)
+    if entry is not None:
+        _progress_log_cached_bytes -= entry[3]
+
+
+def _remember_progress_log(log_url: str, etag: Optional[str], last_modified: Optional[str], text: str, size: int) -> None:
+    global _progress_log_cached_bytes
+    _forget_progress_log(log_url)
+    if size > PROGRESS_LOG_CACHE_BODY_MAX_BYTES:
+        return
+    # Evict oldest first (dicts keep insertion order) until the new body fits.
+    while _progress_log_validators and _progress_log_cached_bytes + size > PROGRESS_LOG_CACHE_TOTAL_MAX_BYTES:
+        _forget_progress_log(next(iter(_progress_log_validators)))
+    _progress_log_validators[log_url] = (etag, last_modified, text, size)
+    _progress_log_cached_bytes += size
+
+
+# Tail-only polls ask the worker for the last bytes of the log instead of all of it.
+PROGRESS_LOG_TAIL_BYTES = 8192
+
+
+async def _fetch_worker_progress_log_tail(log_url: str) -> Tuple[int, str]:
+    resp = await _proxy_http_client().get(
+        log_url, timeout=5.0, headers={"Range": f"bytes=-{PROGRESS_LOG_TAIL_BYTES}"}
+    )
+    if resp.status_code == 416:
+        # Empty file: nothing to range over.
+        return 200, ""
+    if resp.status_code == 206:
+        text = resp.text
+        content_range = resp.headers.get("content-range", "")
+        if not content_range.startswith("bytes 0-"):
+            # Started mid-file: the first line is partial.
+            text = text.split("\n", 1)[1] if "\n" in text else ""
+        return 200, text
+    return resp.status_code, (resp.text if resp.status_code == 200 else "")
+
+
+async def _fetch_worker_progress_log(log_url: str, *, keep: bool = True) -> Tuple[int, str]:
+    """Full log fetch; ``keep`` (running tasks only) reuses the body on a 304."""
+    if not keep:
+        _forget_progress_log(log_url)
+    headers: Dict[str, str] = {}
+    known = _progress_log_validators.get(log_url)
+    if known is not None:
+        etag, last_modified, _text, _size = known
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+    resp = await _proxy_http_client().get(log_url, timeout=5.0, headers=headers)
+    if resp.status_code == 304 and known is not None:
+        return 200, known[2]
+    if resp.status_code != 200:
+        _forget_progress_log(log_url)
+        return resp.status_code, ""
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    if keep and (etag or last_modified):
+        _remember_progress_log(log_url, etag, last_modified, resp.text, len(resp.content))
+    return 200, resp.text
+
+
 @app.get("/api/task/{task_id}/progress_log")
 async def api_task_progress_log(
     task_id: str,
@@ -5476,38 +5848,46 @@ async def api_task_progress_log(
         return {"available": False, "state": task.status}
     
     # Construct log URL on worker
-    from workers import get_worker_base_url
     worker_base = get_worker_base_url(task.worker_api)
     log_url = f"{worker_base}/converter/glb/{task.guid}/{task.guid}_progress.txt"
     
     try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(log_url, timeout=5.0)
-            
-            if resp.status_code == 404:
-                # Log not created yet
-                return {"available": False, "state": task.status}
-            
-            if resp.status_code != 200:
-                return {"available": False, "state": task.status, "error": f"HTTP {resp.status_code}"}
-            
-            # Normalize line endings (Windows -> Unix)
-            full_text = resp.text.replace('\r\n', '\n').replace('\r', '\n')
-            lines = full_text.strip().split('\n') if full_text.strip() else []
-            
-            # Return last N lines as tail, full text if requested
-            tail_count = 10
-            tail_lines = lines[-tail_count:] if len(lines) > tail_count else lines
-            
-            return {
-                "available": True,
-                "state": task.status,
-                "full_text": full_text if full else None,
-                "tail_lines": tail_lines,
-                "total_lines": len(lines),
-                "truncated": len(lines) > tail_count and not full
-            }
+        if full:
+            status_code, log_text = await _cached_worker_poll(
+                ("progress_log", log_url),
+                # A finished log will not change again: drop its kept body.
+                lambda: _fetch_worker_progress_log(log_url, keep=task.status == "processing"),
+            )
+        else:
+            # Only the last lines are returned, so only the log tail is fetched;
+            # total_lines then counts the fetched tail.
+            status_code, log_text = await _cached_worker_poll(
+                ("progress_log_tail", log_url), lambda: _fetch_worker_progress_log_tail(log_url)
+            )
+        
+        if status_code == 404:
+            # Log not created yet
+            return {"available": False, "state": task.status}
+        
+        if status_code != 200:
+            return {"available": False, "state": task.status, "error": f"HTTP {status_code}"}
+        
+        # Normalize line endings (Windows -> Unix)
+        full_text = log_text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = full_text.strip().split('\n') if full_text.strip() else []
+        
+        # Return last N lines as tail, full text if requested
+        tail_count = 10
+        tail_lines = lines[-tail_count:] if len(lines) > tail_count else lines
+        
+        return {
+            "available": True,
+            "state": task.status,
+            "full_text": full_text if full else None,
+            "tail_lines": tail_lines,
+            "total_lines": len(lines),
+            "truncated": len(lines) > tail_count and not full
+        }
     except Exception as e:
         print(f"[Progress Log] Error fetching log for task {task_id}: {e}")
         return {"available": False, "state": task.status, "error": str(e)}
@@ -5537,7 +5917,9 @@ async def api_task_worker_files(
         raise HTTPException(status_code=404, detail="Task not found")
     _require_task_download_access(task=task, user=user, request=request)
 
-    available, all_files, data, error = await _fetch_worker_model_files(task)
+    available, all_files, data, error = await _cached_worker_poll(
+        ("worker_files", task.id, task.guid, task.worker_api), lambda: _fetch_worker_model_files(task)
+    )
     if not available:
         return {"available": False, "files": [], "error": error} if error else {"available": False, "files": []}
 
@@ -6175,7 +6557,6 @@ async def _purchase_animal_animation_pack(
 async def _fetch_animal_variant_progress_line(task: Task) -> Optional[str]:
     if not task.guid or not task.worker_api:
         return None
-    from workers import get_worker_base_url
     worker_base = get_worker_base_url(task.worker_api)
     if not worker_base:
         return None
@@ -6894,25 +7275,27 @@ async def api_retry_task(
     """Retry a stuck task (only if older than 2 hours and not done)"""
     from datetime import timedelta
     
-    task = await get_task_by_id(db, task_id)
-    if not task:
+    gate = await get_task_gate_row(db, task_id)
+    if not gate:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Check if task is owned by current user
-    anon_session = await get_anon_session(request, response, db)
+    # Check if task is owned by current user (the anon cookie only matters for anon tasks)
+    anon_session = None
+    if gate.owner_type == "anon":
+        anon_session = await get_anon_session(request, response, db)
     is_owner = (
-        (user and task.owner_type == "user" and task.owner_id == user.email) or
-        (task.owner_type == "anon" and task.owner_id == anon_session.anon_id)
+        (user and gate.owner_type == "user" and _owner_id_matches(gate.owner_id, user.email)) or
+        (anon_session is not None and _owner_id_matches(gate.owner_id, anon_session.anon_id))
     )
     
     if not is_owner:
         raise HTTPException(status_code=403, detail="Not authorized to retry this task")
     
     # Check if task is eligible for retry
-    if task.status == "done":
+    if gate.status == "done":
         raise HTTPException(status_code=400, detail="Task already completed")
     
-    task_age = datetime.utcnow() - task.created_at
+    task_age = datetime.utcnow() - gate.created_at
     if task_age < timedelta(hours=2):
         remaining = timedelta(hours=2) - task_age
         minutes = int(remaining.total_seconds() / 60)
@@ -6922,9 +7305,13 @@ async def api_retry_task(
         )
     
     # Re-send to worker
-    if not task.input_url:
+    if not gate.input_url:
         raise HTTPException(status_code=400, detail="No input URL to retry")
     
+    task = await get_task_by_id(db, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
     # Create new task (don't deduct credits - it's a retry)
     new_task, error = await create_conversion_task(
         db,
@@ -6951,6 +7338,27 @@ async def api_retry_task(
     )
 
 
+def _clear_restarted_task_caches(task_id: str) -> None:
+    """Clear ALL local caches for a restarted task (so fresh files are downloaded)."""
+    try:
+        static_dir = pathlib.Path(__file__).parent.parent / "static"
+        
+        # 1. Clear GLB cache (prepared.glb, animations.glb)
+        glb_cache = static_dir / "glb_cache"
+        for cache_file in glb_cache.glob(f"{task_id}_*"):
+            cache_file.unlink()
+            print(f"[Restart] Deleted cached GLB: {cache_file.name}")
+        
+        # 2. Clear task files cache (downloads: videos, zips, individual files)
+        task_cache = static_dir / "tasks" / task_id
+        if task_cache.exists():
+            shutil.rmtree(task_cache)
+            print(f"[Restart] Deleted task cache folder: {task_cache.name}")
+            
+    except Exception as e:
+        print(f"[Restart] Failed to clear caches: {e}")
+
+
 @app.post("/api/task/{task_id}/restart", response_model=TaskCreateResponse)
 async def api_restart_task(
     task_id: str,
@@ -6961,24 +7369,25 @@ async def api_restart_task(
 ):
     """Restart task with the same task_id (available after 1 minute)"""
     from datetime import timedelta
-    from workers import select_best_worker, send_task_to_worker
 
-    task = await get_task_by_id(db, task_id)
-    if not task:
+    gate = await get_task_gate_row(db, task_id)
+    if not gate:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    # Check ownership
-    anon_session = await get_anon_session(request, response, db)
+    # Check ownership (the anon cookie only matters for anon tasks)
+    anon_session = None
+    if gate.owner_type == "anon":
+        anon_session = await get_anon_session(request, response, db)
     is_admin = bool(user and is_admin_email(user.email))
     is_owner = (
-        (user and task.owner_type == "user" and task.owner_id == user.email) or
-        (task.owner_type == "anon" and task.owner_id == anon_session.anon_id)
+        (user and gate.owner_type == "user" and _owner_id_matches(gate.owner_id, user.email)) or
+        (anon_session is not None and _owner_id_matches(gate.owner_id, anon_session.anon_id))
     )
     if not (is_owner or is_admin):
         raise HTTPException(status_code=403, detail="Not authorized to restart this task")
 
     # Age gate: 1 minute
-    task_age = datetime.utcnow() - task.created_at
+    task_age = datetime.utcnow() - gate.created_at
     min_age = timedelta(minutes=1)
     if task_age < min_age:
         remaining = min_age - task_age
@@ -6988,15 +7397,18 @@ async def api_restart_task(
             detail=f"Task is too recent. Restart available in {minutes} minutes."
         )
 
-    if not task.input_url:
+    if not gate.input_url:
         raise HTTPException(status_code=400, detail="No input URL to restart")
 
+    task = await get_task_by_id(db, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
     restart_body_data: Dict[str, Any] = {}
     try:
         body = await request.body()
         if body:
-            import json as json_module
-            parsed_body = json_module.loads(body)
+            parsed_body = orjson.loads(body)
             if isinstance(parsed_body, dict):
                 restart_body_data = parsed_body
     except Exception as e:
@@ -7113,32 +7525,17 @@ async def api_restart_task(
     task.viewer_prepared_glb_url = None
     task.viewer_animations_glb_url = None
     
-    # Clear ALL local caches for this task (so fresh files are downloaded)
-    try:
-        import pathlib
-        import shutil
-        static_dir = pathlib.Path(__file__).parent.parent / "static"
-        
-        # 1. Clear GLB cache (prepared.glb, animations.glb)
-        glb_cache = static_dir / "glb_cache"
-        for cache_file in glb_cache.glob(f"{task_id}_*"):
-            cache_file.unlink()
-            print(f"[Restart] Deleted cached GLB: {cache_file.name}")
-        
-        # 2. Clear task files cache (downloads: videos, zips, individual files)
-        task_cache = static_dir / "tasks" / task_id
-        if task_cache.exists():
-            shutil.rmtree(task_cache)
-            print(f"[Restart] Deleted task cache folder: {task_cache.name}")
-            
-    except Exception as e:
-        print(f"[Restart] Failed to clear caches: {e}")
+    # Clear local caches in a thread while the reset commits and a worker is picked
+    # (the session is not shareable, so the DB steps stay sequential).
+    cache_clear = asyncio.ensure_future(asyncio.to_thread(_clear_restarted_task_caches, task_id))
+    _drop_viewer_html_cache(task_id)
 
+    # expire_on_commit=False keeps the reset attributes loaded; no refresh SELECT needed.
     await db.commit()
-    await db.refresh(task)
 
     # Start pipeline for the same task_id without blocking on FBX pre-conversion.
     worker_url = await select_best_worker(db=db)
+    await cache_clear
     if not worker_url:
         raise HTTPException(status_code=500, detail="No workers available")
 
@@ -7169,22 +7566,21 @@ async def api_restart_task(
                     pos = mt.get("position", {})
                     rot = mt.get("rotation", {})
                     scale = mt.get("scale", {})
+                    position = [pos.get(axis, 0) for axis in ("x", "y", "z")]
+                    rotation = [rot.get(axis, 0) for axis in ("x", "y", "z")]
+                    scale_xyz = [scale.get(axis, 1) for axis in ("x", "y", "z")]
                     # Only use if any value is non-default
                     has_transform = (
-                        any(v != 0 for v in [pos.get("x", 0), pos.get("y", 0), pos.get("z", 0)]) or
-                        any(v != 0 for v in [rot.get("x", 0), rot.get("y", 0), rot.get("z", 0)]) or
-                        any(v != 1 for v in [scale.get("x", 1), scale.get("y", 1), scale.get("z", 1)])
+                        any(v != 0 for v in position) or
+                        any(v != 0 for v in rotation) or
+                        any(v != 1 for v in scale_xyz)
                     )
                     if has_transform:
-                        rad_to_deg = 180 / 3.14159265359
                         transform_params = {
-                            "local_position": [pos.get("x", 0), pos.get("y", 0), pos.get("z", 0)],
-                            "local_rotation": [
-                                rot.get("x", 0) * rad_to_deg,
-                                rot.get("y", 0) * rad_to_deg,
-                                rot.get("z", 0) * rad_to_deg
-                            ],
-                            "local_scale": [scale.get("x", 1), scale.get("y", 1), scale.get("z", 1)]
+                            "local_position": position,
+                            # Viewer stores radians; the worker expects degrees.
+                            "local_rotation": [math.degrees(v) for v in rotation],
+                            "local_scale": scale_xyz,
                         }
                         print(f"[Restart] Transform params from viewer_settings: {transform_params}")
             except Exception as e:
@@ -7217,7 +7613,6 @@ async def api_restart_task(
         task.total_count = len(result.output_urls)
         task.status = "processing"
     await db.commit()
-    await db.refresh(task)
 
     return TaskCreateResponse(
         task_id=task.id,
@@ -7249,8 +7644,8 @@ async def api_get_purchase_state(
     
     # Check if user is owner
     is_owner = bool(
-        (user and task.owner_type == "user" and task.owner_id == user.email) or
-        (task.owner_type == "anon" and anon_id and task.owner_id == anon_id)
+        (user and task.owner_type == "user" and _owner_id_matches(task.owner_id, user.email)) or
+        (task.owner_type == "anon" and _owner_id_matches(task.owner_id, anon_id))
     )
 
     can_download = _can_download_task(task=task, user=user, request=request)
@@ -7309,8 +7704,8 @@ async def api_purchase_files(
     
     # Check if user is owner (owners must still purchase to download)
     is_owner = bool(
-        (user and task.owner_type == "user" and task.owner_id == user.email) or
-        (task.owner_type == "anon" and anon_id and task.owner_id == anon_id)
+        (user and task.owner_type == "user" and _owner_id_matches(task.owner_id, user.email)) or
+        (task.owner_type == "anon" and _owner_id_matches(task.owner_id, anon_id))
     )
     
     return PurchaseResponse(
@@ -7606,7 +8001,7 @@ async def api_preview_animation(
             await client.aclose()
 
     return StreamingResponse(
-        worker_resp.aiter_bytes(chunk_size=65536),
+        worker_resp.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE),
         media_type="application/octet-stream",
         headers={"Cache-Control": "no-store, max-age=0"},
         background=BackgroundTask(_close_stream_resources)
@@ -7679,7 +8074,7 @@ async def api_download_animation(
             async with client.stream("GET", file_url, timeout=120.0) as response:
                 if response.status_code != 200:
                     raise HTTPException(status_code=404, detail="Animation file is unavailable")
-                async for chunk in response.aiter_bytes(chunk_size=65536):
+                async for chunk in response.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE):
                     yield chunk
 
     return StreamingResponse(
@@ -7778,7 +8173,7 @@ async def api_download_animation_with_base(
     )
 
 
-@app.get("/api/history", response_model=TaskHistoryResponse)
+@app.get("/api/history", response_model=TaskHistoryResponse, response_model_exclude_none=True)
 async def api_get_history(
     request: Request,
     response: Response,
@@ -8144,10 +8539,42 @@ async def api_toggle_like(
 # =============================================================================
 # Queue Status Endpoint
 # =============================================================================
-@app.get("/api/queue/status", response_model=QueueStatusResponse)
-async def api_queue_status(db: AsyncSession = Depends(get_db)):
+# Polling tabs share one worker fan-out: results are reused briefly and concurrent
+# misses await the same in-flight fetch (single event loop, so no lock is needed).
+QUEUE_STATUS_CACHE_TTL_SECONDS = 1.5
+_queue_status_cache: Dict[str, Any] = {"at": 0.0, "value": None, "inflight": None}
+
+
+async def _fetch_global_queue_status() -> Any:
+    # Own session: the shared fetch can outlive the request that started it.
+    async with AsyncSessionLocal() as db:
+        return await get_global_queue_status(db=db)
+
+
+def _store_global_queue_status(fut: "asyncio.Future") -> None:
+    _queue_status_cache["inflight"] = None
+    if not fut.cancelled() and fut.exception() is None:
+        _queue_status_cache["value"] = fut.result()
+        _queue_status_cache["at"] = time.monotonic()
+
+
+async def _cached_global_queue_status() -> Any:
+    cached = _queue_status_cache["value"]
+    if cached is not None and time.monotonic() - _queue_status_cache["at"] < QUEUE_STATUS_CACHE_TTL_SECONDS:
+        return cached
+    inflight = _queue_status_cache["inflight"]
+    if inflight is None:
+        inflight = asyncio.ensure_future(_fetch_global_queue_status())
+        inflight.add_done_callback(_store_global_queue_status)
+        _queue_status_cache["inflight"] = inflight
+    # shield: a disconnecting poller must not cancel the fetch other callers await.
+    return await asyncio.shield(inflight)
+
+
+@app.get("/api/queue/status", response_model=QueueStatusResponse, response_model_exclude_none=True)
+async def api_queue_status():
     """Get global queue status across all workers"""
-    status = await get_global_queue_status(db=db)
+    status = await _cached_global_queue_status()
     
     return QueueStatusResponse(
         workers=[
@@ -8174,6 +8601,20 @@ async def api_queue_status(db: AsyncSession = Depends(get_db)):
 # =============================================================================
 # Admin Endpoints
 # =============================================================================
+@app.get("/api/admin/db-pool")
+async def api_admin_db_pool(admin: User = Depends(require_admin)):
+    """Connection pool occupancy, for tuning DATABASE_POOL_SIZE / DATABASE_MAX_OVERFLOW (admin only)."""
+    from database import engine
+
+    pool = engine.pool
+    info: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, name, None)
+        if callable(fn):
+            info[name] = fn()
+    return info
+
+
 @app.get("/api/admin/workers", response_model=AdminWorkerListResponse)
 async def api_admin_workers(
     admin: User = Depends(require_admin),
@@ -8484,19 +8925,10 @@ async def api_admin_user_tasks(
     db: AsyncSession = Depends(get_db)
 ):
     """Get tasks for a specific user (admin only)"""
-    # Get user by ID
-    result = await db.execute(
-        select(User).where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
-    
-    if not user:
+    user_tasks = await get_user_tasks_by_user_id(db, user_id, page=page, per_page=per_page)
+    if user_tasks is None:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    # Get user tasks
-    tasks, total = await get_user_tasks(
-        db, owner_type="user", owner_id=user.email, page=page, per_page=per_page
-    )
+    tasks, total = user_tasks
     
     return AdminUserTasksResponse(
         tasks=[
@@ -8802,13 +9234,18 @@ async def api_admin_restart_service(
     import os
     import signal
 
-    # Best-effort: restart background worker now (useful if process doesn't restart immediately)
-    try:
-        await restart_background_worker(request.app)
-    except Exception as e:
-        print(f"[Admin] Failed to restart background worker: {e}")
+    app_ref = request.app
 
     async def _terminate_soon():
+        # Best-effort: restart background worker now (useful if process doesn't restart
+        # immediately). Runs after the response, bounded so a worker stuck in a blocking
+        # step cannot delay the SIGTERM.
+        try:
+            await asyncio.wait_for(restart_background_worker(app_ref), timeout=1.0)
+        except asyncio.TimeoutError:
+            print("[Admin] Background worker restart timed out; terminating anyway")
+        except Exception as e:
+            print(f"[Admin] Failed to restart background worker: {e}")
         await asyncio.sleep(0.5)
         os.kill(os.getpid(), signal.SIGTERM)
 
@@ -8907,7 +9344,6 @@ async def api_admin_cleanup(
     Manually trigger disk cleanup (admin only).
     Runs pressure cleanup until MIN_FREE_SPACE_GB is available.
     """
-    import shutil
     
     # Get current disk stats
     disk_usage = shutil.disk_usage("/")
@@ -8989,7 +9425,6 @@ async def api_admin_disk_stats(
     Get disk usage statistics (admin only).
     Includes per-directory size breakdown (GB) for main data categories.
     """
-    import shutil
 
     disk_usage = shutil.disk_usage("/")
 
@@ -9105,7 +9540,6 @@ async def api_admin_restart_incomplete_tasks(
     # Run restart in background
     async def restart_tasks_background():
         from database import AsyncSessionLocal, Task
-        from workers import select_best_worker, send_task_to_worker
         from telegram_bot import broadcast_task_restarted, broadcast_bulk_restart_summary
         
         async with AsyncSessionLocal() as bg_db:
@@ -9221,13 +9655,46 @@ async def api_admin_restart_incomplete_tasks(
 # =============================================================================
 # Upload Serving
 # =============================================================================
-@app.get("/u/{token}/{filename}")
-async def serve_upload(token: str, filename: str):
-    """Serve uploaded files"""
-    filepath = os.path.join(UPLOAD_DIR, token, filename)
-    if not os.path.exists(filepath):
-        raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(filepath)
+# Uploaded files: nginx serves /u/ straight from UPLOAD_DIR in production; this
+# mount is the fallback when the app is hit directly (workers, local runs).
+# StaticFiles stats off the event loop (one os.stat, handed to FileResponse) and
+# answers conditional requests with 304.
+UPLOAD_MISS_CACHE_TTL_SECONDS = 5.0
+UPLOAD_MISS_CACHE_MAX = 4096
+# Every upload lands in a fresh uuid4 folder and is never rewritten in place.
+UPLOAD_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class _UploadStaticFiles(StaticFiles):
+    """StaticFiles that remembers recent 404s so probe floods skip the stat thread hop."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._misses: Dict[str, float] = {}
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = UPLOAD_CACHE_CONTROL
+        return response
+
+    async def get_response(self, path: str, scope: Any) -> Response:
+        now = time.monotonic()
+        expires = self._misses.get(path)
+        if expires is not None:
+            if expires > now:
+                raise HTTPException(status_code=404)
+            self._misses.pop(path, None)
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as e:
+            if e.status_code == 404:
+                if len(self._misses) >= UPLOAD_MISS_CACHE_MAX:
+                    self._misses.clear()
+                self._misses[path] = now + UPLOAD_MISS_CACHE_TTL_SECONDS
+            raise
+
+
+app.mount("/u", _UploadStaticFiles(directory=UPLOAD_DIR, check_dir=False), name="uploads")
 
 
 # =============================================================================
@@ -9310,28 +9777,18 @@ async def proxy_video(
     if if_range:
         upstream_headers["If-Range"] = if_range
 
-    client = httpx.AsyncClient(timeout=120.0)
+    client = _proxy_http_client()
     try:
         req = client.build_request("GET", source_video_url, headers=upstream_headers)
         worker_resp = await client.send(req, stream=True)
     except Exception:
-        await client.aclose()
         raise HTTPException(status_code=502, detail="Video source unavailable")
 
     if worker_resp.status_code not in (200, 206):
         code = worker_resp.status_code if worker_resp.status_code in (401, 403, 404) else 502
-        try:
-            await worker_resp.aclose()
-        finally:
-            await client.aclose()
+        await worker_resp.aclose()
         raise HTTPException(status_code=code, detail="Video is unavailable")
 
-    async def _close_stream_resources():
-        try:
-            await worker_resp.aclose()
-        finally:
-            await client.aclose()
-
     _source_lower = source_video_url.lower()
     if "_rig_preview.mp4" in _source_lower:
         _vname = f"{task_id}_rig_preview.mp4"
@@ -9362,11 +9819,11 @@ async def proxy_video(
 
     media_type = worker_resp.headers.get("content-type") or "video/mp4"
     return StreamingResponse(
-        worker_resp.aiter_bytes(chunk_size=65536),
+        worker_resp.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE),
         status_code=worker_resp.status_code,
         media_type=media_type,
         headers=response_headers,
-        background=BackgroundTask(_close_stream_resources),
+        background=BackgroundTask(worker_resp.aclose),
     )
 
 
@@ -9405,6 +9862,26 @@ async def _has_paid_access(
     return file_index in purchased_indices
 
 
+_GUID_FILENAME_PREFIX_RE = re.compile(
+    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_', re.IGNORECASE
+)
+_PROXY_FILE_CONTENT_TYPES = {
+    "glb": "model/gltf-binary",
+    "gltf": "model/gltf+json",
+    "fbx": "application/octet-stream",
+    "blend": "application/x-blender",
+    "unitypackage": "application/octet-stream",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "gif": "image/gif",
+    "mp4": "video/mp4",
+    "mov": "video/quicktime",
+    "json": "application/json",
+}
+
+
 @app.get("/api/file/{task_id}/{file_index}")
 async def proxy_file(
     task_id: str,
@@ -9427,28 +9904,11 @@ async def proxy_file(
     filename = file_url.split("/")[-1]
     
     # Clean filename for download (remove GUID)
-    clean_filename = filename
-    import re
-    clean_filename = re.sub(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_', '', filename, flags=re.IGNORECASE)
+    clean_filename = _GUID_FILENAME_PREFIX_RE.sub('', filename)
     
     # Determine content type
-    ext = clean_filename.split(".")[-1].lower()
-    content_types = {
-        "glb": "model/gltf-binary",
-        "gltf": "model/gltf+json",
-        "fbx": "application/octet-stream",
-        "blend": "application/x-blender",
-        "unitypackage": "application/octet-stream",
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "webp": "image/webp",
-        "gif": "image/gif",
-        "mp4": "video/mp4",
-        "mov": "video/quicktime",
-        "json": "application/json",
-    }
-    content_type = content_types.get(ext, "application/octet-stream")
+    ext = os.path.splitext(clean_filename)[1][1:].lower()
+    content_type = _PROXY_FILE_CONTENT_TYPES.get(ext, "application/octet-stream")
     
     # Serve from local cache if present
     cached_path = TASK_CACHE_DIR / task_id / clean_filename
@@ -9464,12 +9924,11 @@ async def proxy_file(
         )
     
     async def stream_file():
-        async with httpx.AsyncClient() as client:
-            async with client.stream("GET", file_url, timeout=120.0) as response:
-                if response.status_code != 200:
-                    return
-                async for chunk in response.aiter_bytes(chunk_size=65536):
-                    yield chunk
+        async with _proxy_http_client().stream("GET", file_url, timeout=120.0) as response:
+            if response.status_code != 200:
+                return
+            async for chunk in response.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE):
+                yield chunk
     
     stream_headers: Dict[str, str] = {
         "Content-Disposition": f"attachment; filename={clean_filename}",
@@ -9512,9 +9971,7 @@ async def proxy_file_by_name(
         raise HTTPException(status_code=404, detail="File not found")
     
     # Clean filename for download (remove GUID)
-    clean_filename = filename
-    import re
-    clean_filename = re.sub(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_', '', filename, flags=re.IGNORECASE)
+    clean_filename = _GUID_FILENAME_PREFIX_RE.sub('', filename)
     
     # Determine index in download list (for purchase checks)
     download_urls = (task.output_urls or []) if (task.output_urls and len(task.output_urls) > 0) else (task.ready_urls or [])
@@ -9526,23 +9983,8 @@ async def proxy_file_by_name(
             break
     
     # Determine content type
-    ext = clean_filename.split(".")[-1].lower()
-    content_types = {
-        "glb": "model/gltf-binary",
-        "gltf": "model/gltf+json",
-        "fbx": "application/octet-stream",
-        "blend": "application/x-blender",
-        "unitypackage": "application/octet-stream",
-        "png": "image/png",
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "webp": "image/webp",
-        "gif": "image/gif",
-        "mp4": "video/mp4",
-        "mov": "video/quicktime",
-        "json": "application/json",
-    }
-    content_type = content_types.get(ext, "application/octet-stream")
+    ext = os.path.splitext(clean_filename)[1][1:].lower()
+    content_type = _PROXY_FILE_CONTENT_TYPES.get(ext, "application/octet-stream")
     
     if task.ga_client_id:
         asyncio.create_task(send_ga4_event(
@@ -9565,12 +10007,11 @@ async def proxy_file_by_name(
         )
     
     async def stream_file():
-        async with httpx.AsyncClient() as client:
-            async with client.stream("GET", file_url, timeout=120.0) as response:
-                if response.status_code != 200:
-                    return
-                async for chunk in response.aiter_bytes(chunk_size=65536):
-                    yield chunk
+        async with _proxy_http_client().stream("GET", file_url, timeout=120.0) as response:
+            if response.status_code != 200:
+                return
+            async for chunk in response.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE):
+                yield chunk
     
     stream_headers_dn: Dict[str, str] = {
         "Content-Disposition": f"attachment; filename={clean_filename}",
@@ -10030,15 +10471,207 @@ async def api_task_download_bundle_zip(
     return await _stream_purchased_task_bundle_zip(task_id, user, request, db)
 
 
+# Viewer HTML rewrite: one compiled alternation, applied in a single pass over the page.
+# Branch order matters at a shared start (absolute converter path before relative path
+# before bare filename); the JS branch only takes unquoted paths, quoted ones are "abs".
+_VIEWER_GUID_RE = re.compile(r'/converter/glb/([a-f0-9\-]+)/')
+_VIEWER_ASSET_RE = re.compile(
+    r'(?P<abs>(?P<abs_q>["\'])(?P<abs_path>/converter/glb/[^"\']+)["\'])'
+    r'|(?P<rel>(?P<rel_q>["\'])(?P<rel_path>\.?\.?/[^"\']+\.(?:mview|json|png|jpg|jpeg|webp)[^"\']*)["\'])'
+    r'|(?P<bare>(?P<bare_q>["\'])(?P<bare_name>[^/"\']+\.(?:mview|json|png|jpg|jpeg|webp))(?P<bare_end>["\']))'
+    r'|(?P<js>(?P<js_attr>src|href|url|load)\s*[:=]\s*(?P<js_path>/converter/glb/[^"\'\s\)]+)["\']?)'
+)
+
+
+def _viewer_asset_replacer(task_id: str, guid: str) -> Callable[[re.Match], str]:
+    """Build the match callback that maps one worker asset path to viewer-resource."""
+    converter_base = f"/converter/glb/{guid}"
+    resource_prefix = f"/api/task/{task_id}/viewer-resource?path="
+
+    def replace(match):
+        matched = match.group(0)
+        # Already-proxied URLs are skipped with a substring test here rather than a
+        # (?![^"']*viewer-resource) lookahead, which rescans forward for every candidate.
+        if 'viewer-resource' in matched or '/api/task/' in matched:
+            return matched
+        kind = match.lastgroup
+        if kind == "abs":
+            # "/converter/glb/..."
+            quote_char = match.group("abs_q")
+            full_path = match.group("abs_path")
+            closing = quote_char
+        elif kind == "rel":
+            # "./file.mview", "../file.mview"
+            quote_char = match.group("rel_q")
+            rel_path = match.group("rel_path").lstrip('./')
+            if not rel_path.startswith(guid):
+                full_path = f"{converter_base}/{guid}_100k/{rel_path}"
+            else:
+                full_path = f"{converter_base}/{rel_path}"
+            closing = quote_char
+        elif kind == "bare":
+            # "model.mview"
+            quote_char = match.group("bare_q")
+            full_path = f"{converter_base}/{guid}_100k/{match.group('bare_name')}"
+            closing = match.group("bare_end")
+        else:
+            # Unquoted paths in JavaScript (src=, href=, etc.)
+            encoded_path = quote(match.group("js_path"), safe='/')
+            return f'{match.group("js_attr")}="{resource_prefix}{encoded_path}"'
+        encoded_path = quote(full_path, safe='/')
+        return f'{quote_char}{resource_prefix}{encoded_path}{closing}'
+
+    return replace
+
+
+def _rewrite_viewer_html_chunk(
+    buffer: str, replace: Callable[[re.Match], str], final: bool
+) -> Tuple[str, str]:
+    """Rewrite the settled prefix of a streamed viewer page; return (output, carry).
+
+    Every asset pattern is bounded by quotes, so a match that starts before the last
+    quote in the buffer is decided already; text from that quote on is carried over
+    to the next chunk. With final=True the whole buffer is rewritten.
+    """
+    limit = len(buffer) if final else max(buffer.rfind('"'), buffer.rfind("'"))
+    if limit <= 0:
+        return "", buffer
+    parts: List[str] = []
+    pos = 0
+    for match in _VIEWER_ASSET_RE.finditer(buffer):
+        if match.start() >= limit:
+            break
+        parts.append(buffer[pos:match.start()])
+        parts.append(replace(match))
+        pos = match.end()
+    cut = max(pos, limit)
+    parts.append(buffer[pos:cut])
+    return "".join(parts), buffer[cut:]
+
+
+def _rewrite_viewer_html(html_content: str, task_id: str, guid: str) -> str:
+    """Point worker asset paths in the viewer HTML at /api/task/{id}/viewer-resource."""
+    return _VIEWER_ASSET_RE.sub(_viewer_asset_replacer(task_id, guid), html_content)
+
+
+# Chunks at least this long are rewritten in a worker thread so the regex pass does
+# not stall other streams on the event loop; smaller ones are cheaper inline.
+VIEWER_REWRITE_THREAD_MIN_CHARS = 64 * 1024
+
+# Rewritten viewer pages by (task_id, viewer_url, guid); TTL matches the page's max-age.
+VIEWER_HTML_CACHE_TTL_SECONDS = 3600.0
+VIEWER_HTML_CACHE_MAX = 1024
+_viewer_html_cache: Dict[Tuple[str, str, str], Tuple[float, str, bytes]] = {}
+
+
+def _viewer_html_cache_get(key: Tuple[str, str, str]) -> Optional[Tuple[str, bytes]]:
+    """Return (etag, body) for a fresh cached page, marking it most recently used."""
+    entry = _viewer_html_cache.pop(key, None)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    _viewer_html_cache[key] = entry
+    return entry[1], entry[2]
+
+
+def _viewer_html_cache_put(
+    key: Tuple[str, str, str],
+    body: bytes,
+    ttl: float = VIEWER_HTML_CACHE_TTL_SECONDS,
+) -> None:
+    while len(_viewer_html_cache) >= VIEWER_HTML_CACHE_MAX:
+        _viewer_html_cache.pop(next(iter(_viewer_html_cache)))
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    _viewer_html_cache[key] = (time.monotonic() + ttl, etag, body)
+
+
+def _viewer_html_disk_path(key: Tuple[str, str, str]) -> Path:
+    task_id, viewer_url, guid = key
+    digest = hashlib.blake2b(f"{viewer_url}\n{guid}".encode("utf-8"), digest_size=8).hexdigest()
+    return TASK_CACHE_DIR / task_id / ".meta" / f"viewer_{digest}.html"
+
+
+def _read_cached_viewer_html(key: Tuple[str, str, str]) -> Optional[Tuple[bytes, float]]:
+    """Return (body, remaining TTL seconds) for an unexpired on-disk copy."""
+    path = _viewer_html_disk_path(key)
+    try:
+        remaining = VIEWER_HTML_CACHE_TTL_SECONDS - (time.time() - path.stat().st_mtime)
+        if remaining <= 0:
+            path.unlink(missing_ok=True)
+            return None
+        return path.read_bytes(), remaining
+    except OSError:
+        return None
+
+
+def _write_cached_viewer_html(key: Tuple[str, str, str], body: bytes) -> None:
+    try:
+        path = _viewer_html_disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"[Viewer] Failed to write viewer HTML cache for task {key[0]}: {e}")
+
+
+def _drop_viewer_html_cache(task_id: str) -> None:
+    for key in [key for key in _viewer_html_cache if key[0] == task_id]:
+        _viewer_html_cache.pop(key, None)
+
+
+def _remove_cached_viewer_html_files(task_id: str) -> None:
+    for path in (TASK_CACHE_DIR / task_id / ".meta").glob("viewer_*.html"):
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[Viewer] Failed to remove viewer HTML cache {path.name} for task {task_id}: {e}")
+
+
+async def invalidate_viewer_html_cache(task_id: str) -> None:
+    """Forget the rewritten viewer page (memory and disk) after the task's viewer artifacts change."""
+    _drop_viewer_html_cache(task_id)
+    await asyncio.to_thread(_remove_cached_viewer_html_files, task_id)
+
+
+async def _iter_and_cache_viewer_html(
+    parts: AsyncIterator[str], key: Tuple[str, str, str]
+) -> AsyncIterator[str]:
+    """Pass streamed parts through and cache the full page once it completes."""
+    collected: List[str] = []
+    async for part in parts:
+        collected.append(part)
+        yield part
+    body = "".join(collected).encode("utf-8")
+    _viewer_html_cache_put(key, body)
+    await asyncio.to_thread(_write_cached_viewer_html, key, body)
+
+
+async def _iter_rewritten_viewer_html(
+    chunks: AsyncIterator[str], task_id: str, guid: str
+) -> AsyncIterator[str]:
+    """Rewrite a streamed viewer page chunk by chunk without buffering the whole body."""
+    replace = _viewer_asset_replacer(task_id, guid)
+    carry = ""
+    async for chunk in chunks:
+        buffer = carry + chunk
+        if len(buffer) >= VIEWER_REWRITE_THREAD_MIN_CHARS:
+            out, carry = await asyncio.to_thread(_rewrite_viewer_html_chunk, buffer, replace, False)
+        else:
+            out, carry = _rewrite_viewer_html_chunk(buffer, replace, final=False)
+        if out:
+            yield out
+    out, _ = _rewrite_viewer_html_chunk(carry, replace, final=True)
+    if out:
+        yield out
+
+
 @app.get("/api/task/{task_id}/viewer")
 async def api_proxy_viewer(
     task_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """Proxy 3D viewer HTML file from worker to avoid mixed content issues"""
-    import re
-    from urllib.parse import urlparse, urljoin
-    
     task = await get_task_by_id(db, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -10055,112 +10688,63 @@ async def api_proxy_viewer(
     parsed = urlparse(viewer_url)
     worker_base = f"{parsed.scheme}://{parsed.netloc}"
     
-    # Proxy the HTML file
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(viewer_url, timeout=30.0, follow_redirects=True)
-            response.raise_for_status()
-            
-            # Get HTML content
-            html_content = response.text
-            
-            # Replace relative paths with proxy URLs
-            # Extract GUID from viewer URL
-            guid_match = re.search(r'/converter/glb/([a-f0-9\-]+)/', viewer_url)
-            if guid_match:
-                guid = guid_match.group(1)
-            else:
-                guid = task.guid or task_id
-            
-            converter_base = f"/converter/glb/{guid}"
-            from urllib.parse import quote
-            
-            # Strategy: Replace paths in two passes to avoid recursion
-            # First pass: Find and replace paths that are NOT inside viewer-resource URLs
-            # Use negative lookahead to ensure we don't touch already replaced paths
-            
-            # Replace absolute paths: "/converter/glb/..." 
-            # Only match if NOT followed by viewer-resource in the same attribute/string
-            def replace_absolute_path(match):
-                quote_char = match.group(1)
-                path = match.group(2)
-                # Double check - if path somehow contains our proxy, skip
-                if '/api/task/' in path or 'viewer-resource' in path:
-                    return match.group(0)
-                encoded_path = quote(path, safe='/')
-                return f'{quote_char}/api/task/{task_id}/viewer-resource?path={encoded_path}{quote_char}'
-            
-            # Use negative lookahead to avoid matching inside already replaced URLs
-            html_content = re.sub(
-                r'(["\'])(/converter/glb/[^"\']+)(["\'])(?![^"\']*viewer-resource)',
-                replace_absolute_path,
-                html_content
-            )
-            
-            # Replace relative paths: "./file.mview", "../file.mview"
-            def replace_relative_path(match):
-                quote_char = match.group(1)
-                rel_path = match.group(2).lstrip('./')
-                if '/api/task/' in rel_path or 'viewer-resource' in rel_path:
-                    return match.group(0)
-                if not rel_path.startswith(guid):
-                    full_path = f"{converter_base}/{guid}_100k/{rel_path}"
-                else:
-                    full_path = f"{converter_base}/{rel_path}"
-                encoded_path = quote(full_path, safe='/')
-                return f'{quote_char}/api/task/{task_id}/viewer-resource?path={encoded_path}{quote_char}'
-            
-            html_content = re.sub(
-                r'(["\'])(\.?\.?/[^"\']+\.(mview|json|png|jpg|jpeg|webp)[^"\']*)(["\'])(?![^"\']*viewer-resource)',
-                replace_relative_path,
-                html_content
-            )
-            
-            # Handle bare filenames (e.g., "model.mview")
-            def replace_bare_filename(match):
-                quote_char = match.group(1)
-                filename = match.group(2)
-                closing_quote = match.group(3)
-                if '/api/task/' in filename or 'viewer-resource' in filename:
-                    return match.group(0)
-                full_path = f"{converter_base}/{guid}_100k/{filename}"
-                encoded_path = quote(full_path, safe='/')
-                return f'{quote_char}/api/task/{task_id}/viewer-resource?path={encoded_path}{closing_quote}'
-            
-            html_content = re.sub(
-                r'(["\'])([^/"\']+\.(mview|json|png|jpg|jpeg|webp))(["\'])(?![^"\']*viewer-resource)',
-                replace_bare_filename,
-                html_content
-            )
-            
-            # Handle paths in JavaScript (src=, href=, etc.) - be more careful
-            def replace_js_path(match):
-                attr = match.group(1)
-                path = match.group(2)
-                if '/api/task/' in path or 'viewer-resource' in path:
-                    return match.group(0)
-                encoded_path = quote(path, safe='/')
-                return f'{attr}="/api/task/{task_id}/viewer-resource?path={encoded_path}"'
-            
-            html_content = re.sub(
-                r'(src|href|url|load)\s*[:=]\s*["\']?(/converter/glb/[^"\'\s\)]+)["\']?(?![^"\']*viewer-resource)',
-                replace_js_path,
-                html_content
-            )
-            
-            # Return as HTML with proper headers
-            return Response(
-                content=html_content,
-                media_type="text/html",
-                headers={
-                    "X-Frame-Options": "SAMEORIGIN",
-                    "Cache-Control": "public, max-age=3600"
-                }
-            )
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Failed to fetch viewer: {str(e)}")
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail="Viewer not available")
+    # Extract GUID from viewer URL
+    guid_match = _VIEWER_GUID_RE.search(viewer_url)
+    if guid_match:
+        guid = guid_match.group(1)
+    else:
+        guid = task.guid or task_id
+
+    viewer_headers = {
+        "X-Frame-Options": "SAMEORIGIN",
+        "Cache-Control": "public, max-age=3600"
+    }
+    cache_key = (task_id, viewer_url, guid)
+    cached = _viewer_html_cache_get(cache_key)
+    if cached is None:
+        # The on-disk copy outlives process restarts but keeps its original expiry;
+        # viewer artifact updates and task restarts remove it.
+        disk_hit = await asyncio.to_thread(_read_cached_viewer_html, cache_key)
+        if disk_hit is not None:
+            _viewer_html_cache_put(cache_key, *disk_hit)
+            cached = _viewer_html_cache_get(cache_key)
+    if cached is not None:
+        etag, body = cached
+        viewer_headers["ETag"] = etag
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=viewer_headers)
+        return Response(content=body, media_type="text/html", headers=viewer_headers)
+
+    # Stream the HTML file and rewrite asset paths as it arrives
+    client = _proxy_http_client()
+    try:
+        req = client.build_request("GET", viewer_url, timeout=30.0)
+        response = await client.send(req, stream=True, follow_redirects=True)
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch viewer: {str(e)}")
+
+    if response.status_code >= 400:
+        await response.aclose()
+        raise HTTPException(status_code=response.status_code, detail="Viewer not available")
+
+    # Workers serve UTF-8 viewer pages; pin the decoder instead of resolving it per response.
+    response.encoding = "utf-8"
+    return StreamingResponse(
+        _iter_and_cache_viewer_html(
+            _iter_rewritten_viewer_html(response.aiter_text(), task_id, guid), cache_key
+        ),
+        media_type="text/html",
+        headers=viewer_headers,
+        background=BackgroundTask(response.aclose),
+    )
+
+
+# Extension fallback when the worker sends no (or a generic) Content-Type.
+_VIEWER_RESOURCE_FALLBACK_TYPES = (
+    (".png", "image/png"),
+    ((".jpg", ".jpeg"), "image/jpeg"),
+    (".json", "application/json"),
+)
 
 
 @app.get("/api/task/{task_id}/viewer-resource")
@@ -10180,7 +10764,6 @@ async def api_proxy_viewer_resource(
     if not task.worker_api:
         raise HTTPException(status_code=404, detail="Worker info not found")
     
-    from workers import get_worker_base_url
     worker_base = get_worker_base_url(task.worker_api)
     
     # Decode path (in case it was double-encoded or has quotes)
@@ -10191,36 +10774,40 @@ async def api_proxy_viewer_resource(
     # Construct full URL
     resource_url = f"{worker_base}{path}"
     
-    # Proxy the resource
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(resource_url, timeout=30.0, follow_redirects=True)
-            response.raise_for_status()
-            
-            # Determine content type
-            content_type = response.headers.get("content-type", "application/octet-stream")
-            if not content_type or content_type == "application/octet-stream":
-                if path.endswith(".mview"):
-                    content_type = "application/octet-stream"
-                elif path.endswith(".png"):
-                    content_type = "image/png"
-                elif path.endswith(".jpg") or path.endswith(".jpeg"):
-                    content_type = "image/jpeg"
-                elif path.endswith(".json"):
-                    content_type = "application/json"
-            
-            return Response(
-                content=response.content,
-                media_type=content_type,
-                headers={
-                    "Cache-Control": "public, max-age=3600",
-                    "Access-Control-Allow-Origin": "*"
-                }
-            )
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=502, detail=f"Failed to fetch resource: {str(e)}")
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail="Resource not available")
+    # Stream the resource through without buffering it in memory
+    client = _proxy_http_client()
+    try:
+        req = client.build_request("GET", resource_url, timeout=30.0)
+        response = await client.send(req, stream=True, follow_redirects=True)
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to fetch resource: {str(e)}")
+
+    if response.status_code >= 400:
+        await response.aclose()
+        raise HTTPException(status_code=response.status_code, detail="Resource not available")
+
+    # Determine content type
+    content_type = response.headers.get("content-type", "application/octet-stream")
+    if not content_type or content_type == "application/octet-stream":
+        content_type = next(
+            (mime for suffixes, mime in _VIEWER_RESOURCE_FALLBACK_TYPES if path.endswith(suffixes)),
+            "application/octet-stream",
+        )
+
+    resource_headers = {
+        "Cache-Control": "public, max-age=3600",
+        "Access-Control-Allow-Origin": "*"
+    }
+    content_length = response.headers.get("content-length")
+    if content_length and not response.headers.get("content-encoding"):
+        resource_headers["Content-Length"] = content_length
+
+    return StreamingResponse(
+        response.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE),
+        media_type=content_type,
+        headers=resource_headers,
+        background=BackgroundTask(response.aclose),
+    )
 
 
 # =============================================================================
@@ -10328,8 +10915,6 @@ async def _resolve_task_worker_file_url(task: Task, suffix: str) -> Optional[str
     if not task.guid or not task.worker_api:
         return None
 
-    from workers import get_worker_base_url
-
     worker_base = get_worker_base_url(task.worker_api)
     if not worker_base:
         return None
@@ -10408,8 +10993,6 @@ async def _resolve_task_blueprint_model_url(task: Task) -> Optional[str]:
     if not task.guid or not task.worker_api:
         return None
 
-    from workers import get_worker_base_url
-
     worker_base = get_worker_base_url(task.worker_api)
     if not worker_base:
         return None
@@ -11103,8 +11686,6 @@ async def _rig_article_response(rig_key: str, lang: str, db: AsyncSession) -> HT
 
 def _resolve_worker_base_from_task(task) -> Optional[str]:
     """Resolve worker base URL from task metadata without requiring worker_api."""
-    from workers import get_worker_base_url
-
     # 1) Best source: normalized worker_api.
     if getattr(task, "worker_api", None):
         try:
@@ -11185,6 +11766,16 @@ def _glb_viewer_headers(profile: str) -> Dict[str, str]:
     }
 
 
+_MODEL_PROXY_CONTENT_TYPES = {
+    "glb": "model/gltf-binary",
+    "fbx": "application/octet-stream",
+    "blend": "application/x-blender",
+    "json": "application/json",
+    "mp4": "video/mp4",
+    "zip": "application/zip",
+}
+
+
 async def _proxy_model_file(
     url: str,
     filename: str,
@@ -11198,16 +11789,8 @@ async def _proxy_model_file(
     Content-Encoding identity skips app-level gzip on binary streams.
     """
     # Determine content type
-    ext = filename.split(".")[-1].lower()
-    content_types = {
-        "glb": "model/gltf-binary",
-        "fbx": "application/octet-stream",
-        "blend": "application/x-blender",
-        "json": "application/json",
-        "mp4": "video/mp4",
-        "zip": "application/zip",
-    }
-    content_type = content_types.get(ext, "application/octet-stream")
+    ext = os.path.splitext(filename)[1][1:].lower()
+    content_type = _MODEL_PROXY_CONTENT_TYPES.get(ext, "application/octet-stream")
     
     # Large ZIP bundles: allow long reads from worker (nginx should use long proxy_read_timeout too).
     allow_redirects = required_snapshot is None
@@ -12243,7 +12826,6 @@ async def purge_gallery_upstream_dead_tasks(
 
     Use ``offset`` to skip a block of rows that already passed HEAD checks (no deletes in prior batch).
     """
-    import httpx
 
     limit = batch if batch is not None else GALLERY_UPSTREAM_PURGE_BATCH
     result = await db.execute(
@@ -12408,7 +12990,6 @@ async def api_proxy_model_glb(
     if not task.guid or not task.worker_api:
         raise HTTPException(status_code=404, detail="Model not available yet")
     
-    from workers import get_worker_base_url
     worker_base = get_worker_base_url(task.worker_api)
     model_url = f"{worker_base}/converter/glb/{task.guid}/{task.guid}.glb"
     
@@ -12877,8 +13458,6 @@ async def api_proxy_prepared_glb(
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    from workers import get_worker_base_url
-    
     # Optimized preview cache/URL always wins over the full prepared download.
     optimized_cache_path = GLB_CACHE_DIR / f"{task_id}_prepared_viewer.glb"
     if optimized_cache_path.exists() and _validate_glb_file(optimized_cache_path):
@@ -13276,7 +13855,7 @@ async def api_free3d_glb(guid: str, filename: str):
             async with client.stream("GET", url) as resp:
                 if resp.status_code != 200:
                     return
-                async for chunk in resp.aiter_bytes(chunk_size=65536):
+                async for chunk in resp.aiter_bytes(chunk_size=PROXY_CHUNK_SIZE):
                     yield chunk
     
     return StreamingResponse(
@@ -13300,7 +13879,6 @@ def validate_telegram_init_data(init_data: str) -> Optional[dict]:
         return None
     
     from urllib.parse import parse_qs, unquote
-    import json
     
     try:
         # Parse init_data
@@ -14218,7 +14796,7 @@ async def api_set_viewer_default_camera(
     try:
         existing = _read_json_file(VIEWER_DEFAULT_SETTINGS_PATH)
         if not existing:
-            existing = json.loads(json.dumps(DEFAULT_VIEWER_SETTINGS))
+            existing = orjson.loads(orjson.dumps(DEFAULT_VIEWER_SETTINGS))
         existing["camera"] = camera_settings
         _atomic_write_json_file(VIEWER_DEFAULT_SETTINGS_PATH, existing)
     except Exception as e:
@@ -14746,21 +15324,24 @@ STATIC_PAGE_CANONICAL_PATHS: Dict[str, str] = {
 PUBLIC_QUERY_NOINDEX_PATHS = {"/", "/gallery"}
 
 
-def _response_without_body(response: Response) -> Response:
+def _response_without_body(response: Response, status_code: Optional[int] = None) -> Response:
     headers = dict(response.headers)
     headers.pop("content-length", None)
     return Response(
         content=b"",
-        status_code=response.status_code,
+        status_code=status_code or response.status_code,
         headers=headers,
         media_type=getattr(response, "media_type", None),
     )
 
 
+_HEAD_FALLBACK_PATHS = frozenset(
+    {"/", "/task", "/dashboard", "/admin", "/admin/workers", *STATIC_PAGE_CANONICAL_PATHS.values()}
+)
+
+
 def _should_fallback_head_to_get(path: str) -> bool:
-    if path in {"/", "/task", "/dashboard", "/admin", "/admin/workers"}:
-        return True
-    return path in set(STATIC_PAGE_CANONICAL_PATHS.values())
+    return path in _HEAD_FALLBACK_PATHS
 
 
 @app.middleware("http")
@@ -14774,6 +15355,12 @@ async def seo_http_headers_and_head_fallback(request: Request, call_next):
     response = await call_next(request)
 
     path = request.url.path
+    if response.status_code == 200 and original_method in ("GET", "HEAD"):
+        etag = response.headers.get("etag")
+        if etag and _should_fallback_head_to_get(path) and _request_etag_matches(request, etag):
+            request.scope["method"] = original_method
+            return _response_without_body(response, status_code=304)
+
     if path == "/dashboard":
         response.headers["X-Robots-Tag"] = "noindex, nofollow"
     elif path.startswith("/m/"):
@@ -14788,11 +15375,54 @@ async def seo_http_headers_and_head_fallback(request: Request, call_next):
     return response
 
 
+_STATIC_TEXT_CACHE: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_STATIC_HTML_CACHE: Dict[str, Tuple[Tuple[Any, ...], bytes, str]] = {}
+# Pages are re-stat'ed (page + partials) at most this often; in between the cached
+# render is served without touching the filesystem.
+STATIC_HTML_RECHECK_SECONDS = 1.0
+_STATIC_HTML_CHECKED_AT: Dict[str, float] = {}
+# Shell pages depend on /auth/me state and must revalidate; marketing pages only
+# change on deploy, so browsers/CDNs may reuse them for an hour.
+_STATIC_SHELL_PAGES = frozenset({"index.html", "admin.html", "admin-workers.html", "dashboard.html"})
+STATIC_SHELL_CACHE_CONTROL = "no-cache"
+STATIC_LANDING_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+_STATIC_DIR_STR = str(STATIC_DIR)
+_STATIC_PARTIALS_DIR_STR = str(STATIC_DIR / "partials")
+_STATIC_PARTIAL_PATHS = tuple(
+    os.path.join(_STATIC_PARTIALS_DIR_STR, name)
+    for name in ("site-header.html", "site-free3d-search.html", "site-footer.html")
+)
+# Resolved once at import: handlers serve these on every landing-page hit.
+_STATIC_PAGE_PATHS: Dict[str, str] = {
+    name: os.path.join(_STATIC_DIR_STR, name)
+    for name in (*STATIC_PAGE_CANONICAL_PATHS, "task.html", "admin.html", "admin-workers.html", "dashboard.html")
+}
+
+
+def _static_file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_static_text_cached(path: str) -> Optional[str]:
+    """Read a static text file, reusing the cached copy until mtime/size change."""
+    signature = _static_file_signature(path)
+    if signature is None:
+        _STATIC_TEXT_CACHE.pop(path, None)
+        return None
+    cached = _STATIC_TEXT_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    text = Path(path).read_text(encoding="utf-8")
+    _STATIC_TEXT_CACHE[path] = (signature, text)
+    return text
+
+
 def _read_static_partial(name: str) -> str:
-    path = STATIC_DIR / "partials" / name
-    if not path.is_file():
-        return ""
-    return path.read_text(encoding="utf-8")
+    return _read_static_text_cached(os.path.join(_STATIC_PARTIALS_DIR_STR, name)) or ""
 
 
 def _inject_static_layout(html_content: str, canonical_path: Optional[str] = None) -> str:
@@ -14839,25 +15469,58 @@ def _inject_static_layout(html_content: str, canonical_path: Optional[str] = Non
 
 
 def _static_html_response(filename: str) -> HTMLResponse:
-    path = STATIC_DIR / filename
-    if not path.is_file():
-        raise HTTPException(status_code=404, detail="Not found")
-    return HTMLResponse(
-        content=_inject_static_layout(
-            path.read_text(encoding="utf-8"),
-            canonical_path=STATIC_PAGE_CANONICAL_PATHS.get(filename),
+    """Serve a static page with the shared layout injected.
+
+    The rendered bytes are kept in memory and only rebuilt when the page or one
+    of the layout partials changes on disk, so hot-deployed HTML is picked up
+    without re-reading and re-rendering the file on every request. The on-disk
+    check itself runs at most once per STATIC_HTML_RECHECK_SECONDS per page.
+    """
+    now = time.monotonic()
+    cached = _STATIC_HTML_CACHE.get(filename)
+    if cached is not None and now - _STATIC_HTML_CHECKED_AT.get(filename, 0.0) < STATIC_HTML_RECHECK_SECONDS:
+        signature = cached[0]
+    else:
+        path = _STATIC_PAGE_PATHS.get(filename) or os.path.join(_STATIC_DIR_STR, filename)
+        signature = (_static_file_signature(path),) + tuple(
+            _static_file_signature(partial_path) for partial_path in _STATIC_PARTIAL_PATHS
         )
+        if signature[0] is None:
+            _STATIC_HTML_CACHE.pop(filename, None)
+            raise HTTPException(status_code=404, detail="Not found")
+        _STATIC_HTML_CHECKED_AT[filename] = now
+    if cached is None or cached[0] != signature:
+        html_content = _read_static_text_cached(path)
+        if html_content is None:
+            raise HTTPException(status_code=404, detail="Not found")
+        body = _inject_static_layout(
+            html_content,
+            canonical_path=STATIC_PAGE_CANONICAL_PATHS.get(filename),
+        ).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        cached = (signature, body, etag)
+        _STATIC_HTML_CACHE[filename] = cached
+    return HTMLResponse(
+        content=cached[1],
+        headers={
+            "Cache-Control": (
+                STATIC_SHELL_CACHE_CONTROL if filename in _STATIC_SHELL_PAGES else STATIC_LANDING_CACHE_CONTROL
+            ),
+            "ETag": cached[2],
+        },
     )
 
 
 def _task_cache_dir_size_bytes(task_id: str) -> Optional[int]:
-    """Sum of file sizes under static/tasks/{task_id}/ when cache exists."""
+    """Sum of file sizes under static/tasks/{task_id}/ when cache exists (.meta excluded)."""
     d = TASK_CACHE_DIR / task_id
     if not d.is_dir():
         return None
     total = 0
     try:
         for p in d.rglob("*"):
+            if ".meta" in p.relative_to(d).parts:
+                continue
             if p.is_file():
                 total += p.stat().st_size
     except OSError:
@@ -14967,6 +15630,7 @@ async def cache_task_files(task_id: str, ready_urls: list, guid: str = None) ->
     """
     cache_dir = TASK_CACHE_DIR / task_id
     cache_dir.mkdir(parents=True, exist_ok=True)
+    await invalidate_viewer_html_cache(task_id)
     
     cached_files = []
     errors = []
@@ -15084,7 +15748,6 @@ async def cleanup_disk_space(
     if delete_task_rows is None:
         delete_task_rows = AUTOMATIC_TASK_DB_DELETION
     from datetime import timedelta
-    import shutil
 
     min_free_bytes = min_free_gb * 1024 * 1024 * 1024
     min_age_hours = CLEANUP_MIN_AGE_HOURS
@@ -15359,39 +16022,51 @@ async def serve_skill_md():
     raise HTTPException(status_code=404, detail="skill.md not found")
 
 
+LLM_TXT_PATH = os.path.join(_STATIC_DIR_STR, "llm.txt")
+LLMS_TXT_PATH = os.path.join(_STATIC_DIR_STR, "llms.txt")
+
+
 @app.get("/llm.txt")
 async def serve_llm_txt():
     """Root llm.txt for crawlers and LLM tooling (plain-text site summary + links)."""
-    path = STATIC_DIR / "llm.txt"
-    if path.is_file():
-        return FileResponse(str(path), media_type="text/plain; charset=utf-8")
+    if os.path.isfile(LLM_TXT_PATH):
+        return FileResponse(LLM_TXT_PATH, media_type="text/plain; charset=utf-8")
     raise HTTPException(status_code=404, detail="llm.txt not found")
 
 
 @app.get("/llms.txt")
 async def serve_llms_txt():
     """De-facto LLM discovery file; keep /llm.txt as backward-compatible alias."""
-    path = STATIC_DIR / "llms.txt"
-    if path.is_file():
-        return FileResponse(str(path), media_type="text/plain; charset=utf-8")
-    fallback = STATIC_DIR / "llm.txt"
-    if fallback.is_file():
-        return FileResponse(str(fallback), media_type="text/plain; charset=utf-8")
+    if os.path.isfile(LLMS_TXT_PATH):
+        return FileResponse(LLMS_TXT_PATH, media_type="text/plain; charset=utf-8")
+    if os.path.isfile(LLM_TXT_PATH):
+        return FileResponse(LLM_TXT_PATH, media_type="text/plain; charset=utf-8")
     raise HTTPException(status_code=404, detail="llms.txt not found")
 
 
+# Probes only need liveness; the body is static so each hit is a constant write.
+HEALTH_RESPONSE_BODY = b'{"status":"ok"}'
+
+
+@app.get("/health", include_in_schema=False)
+async def health():
+    """Liveness probe for nginx/load balancers (no DB, no timestamp)."""
+    return Response(content=HEALTH_RESPONSE_BODY, media_type="application/json")
+
+
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 FAVICON_SVG = STATIC_DIR / "images" / "logo" / "favicon.svg"
+FAVICON_SVG_PATH = str(FAVICON_SVG)
 
 
 @app.get("/favicon.ico")
 async def favicon_ico():
     """Browsers request /favicon.ico by default; serve existing SVG (no separate .ico asset)."""
-    if not FAVICON_SVG.is_file():
+    if not os.path.isfile(FAVICON_SVG_PATH):
         raise HTTPException(status_code=404, detail="Not found")
-    return FileResponse(str(FAVICON_SVG), media_type="image/svg+xml")
+    return FileResponse(FAVICON_SVG_PATH, media_type="image/svg+xml")
 
 
 @app.get("/")
@@ -15419,8 +16094,9 @@ async def task_page(
     """Serve task page with dynamic OG meta tags for Telegram/social sharing"""
     
     # Read base template
-    task_html_path = STATIC_DIR / "task.html"
-    html_content = task_html_path.read_text(encoding="utf-8")
+    html_content = _read_static_text_cached(_STATIC_PAGE_PATHS["task.html"])
+    if html_content is None:
+        raise HTTPException(status_code=404, detail="Not found")
     
     # If no task_id, return default page (non-indexable)
     if not id:
@@ -15801,12 +16477,6 @@ async def user_agreement_page():
     return _static_html_response("user-agreement.html")
 
 
-@app.get("/guides")
-async def guides_page():
-    """Guides page"""
-    return _static_html_response("guides.html")
-
-
 @app.get("/t-pose-rig")
 async def t_pose_rig_page():
     """T-pose rig page"""
@@ -16045,17 +16715,21 @@ async def sitemap_index(db: AsyncSession = Depends(get_db)):
     return Response(content=xml, media_type="application/xml; charset=utf-8")
 
 
+SITEMAP_PAGES_PATH = os.path.join(_STATIC_DIR_STR, "sitemap-pages.xml")
+SITEMAP_LEGACY_PATH = os.path.join(_STATIC_DIR_STR, "sitemap.xml")
+SITEMAP_MIRROR_PATH = str(BASE_DIR / "backend" / "data" / "sitemap_generated" / "sitemap.xml")
+
+
 @app.head("/sitemap/pages.xml")
 @app.get("/sitemap/pages.xml")
 async def sitemap_pages():
     """Marketing / guide urlset (was static/sitemap.xml)."""
-    path = STATIC_DIR / "sitemap-pages.xml"
-    if not path.is_file():
+    if not os.path.isfile(SITEMAP_PAGES_PATH):
         return FileResponse(
-            str(STATIC_DIR / "sitemap.xml"),
+            SITEMAP_LEGACY_PATH,
             media_type="application/xml",
         )
-    return FileResponse(str(path), media_type="application/xml")
+    return FileResponse(SITEMAP_PAGES_PATH, media_type="application/xml")
 
 
 @app.head("/sitemap-mirror.xml")
@@ -16065,9 +16739,8 @@ async def sitemap_mirror(db: AsyncSession = Depends(get_db)):
     Mirror sitemap index from the latest daily refresh (`backend/scripts/daily_sitemap_refresh.py`).
     Falls back to live /sitemap.xml when mirror file is absent.
     """
-    mirror_path = BASE_DIR / "backend" / "data" / "sitemap_generated" / "sitemap.xml"
-    if mirror_path.is_file():
-        return FileResponse(str(mirror_path), media_type="application/xml; charset=utf-8")
+    if os.path.isfile(SITEMAP_MIRROR_PATH):
+        return FileResponse(SITEMAP_MIRROR_PATH, media_type="application/xml; charset=utf-8")
     return await sitemap_index(db)
 
 
@@ -16133,11 +16806,14 @@ async def sitemap_videos(db: AsyncSession = Depends(get_db)):
     return Response(content=xml, media_type="application/xml; charset=utf-8")
 
 
+ROBOTS_TXT_PATH = os.path.join(_STATIC_DIR_STR, "robots.txt")
+
+
 @app.get("/robots.txt")
 async def robots():
     """Serve robots.txt for crawlers"""
     return FileResponse(
-        str(STATIC_DIR / "robots.txt"),
+        ROBOTS_TXT_PATH,
         media_type="text/plain"
     )
 
@@ -16145,6 +16821,9 @@ async def robots():
 # Search engine verification files
 INDEXNOW_KEY = "793f81f63218433f87e43c0afd353c14"
 INDEXNOW_KEY_FILE = f"{INDEXNOW_KEY}.txt"
+INDEXNOW_KEY_PATH = os.path.join(_STATIC_DIR_STR, INDEXNOW_KEY_FILE)
+YANDEX_VERIFICATION_PATH = os.path.join(_STATIC_DIR_STR, "yandex_7bb48a0ce446816a.html")
+BING_SITE_AUTH_PATH = os.path.join(_STATIC_DIR_STR, "BingSiteAuth.xml")
 
 
 @app.head(f"/{INDEXNOW_KEY_FILE}")
@@ -16152,7 +16831,7 @@ INDEXNOW_KEY_FILE = f"{INDEXNOW_KEY}.txt"
 async def indexnow_key_file():
     """Serve the IndexNow API key from the site root."""
     return FileResponse(
-        str(STATIC_DIR / INDEXNOW_KEY_FILE),
+        INDEXNOW_KEY_PATH,
         media_type="text/plain",
     )
 
@@ -16160,14 +16839,14 @@ async def indexnow_key_file():
 @app.get("/yandex_7bb48a0ce446816a.html")
 async def yandex_verification():
     """Yandex Webmaster verification file"""
-    return FileResponse(str(STATIC_DIR / "yandex_7bb48a0ce446816a.html"))
+    return FileResponse(YANDEX_VERIFICATION_PATH)
 
 
 @app.get("/BingSiteAuth.xml")
 async def bing_verification():
     """Bing Webmaster verification file"""
     return FileResponse(
-        str(STATIC_DIR / "BingSiteAuth.xml"),
+        BING_SITE_AUTH_PATH,
         media_type="application/xml"
     )
 
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 from html import escape
 from typing import Any, Optional
+from urllib.parse import parse_qsl
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import HTMLResponse
@@ -276,6 +277,10 @@ def build_router(get_current_user) -> APIRouter:
                 raw_token = str((await request.json()).get("token") or "")
             except Exception:
                 raw_token = ""
+        elif content_type.startswith("application/x-www-form-urlencoded"):
+            # The accept page posts a one-field urlencoded form; skip the multipart parser.
+            body = (await request.body()).decode("utf-8", errors="ignore")
+            raw_token = str(dict(parse_qsl(body, keep_blank_values=True)).get("token") or "")
         else:
             try:
                 raw_token = str((await request.form()).get("token") or "")
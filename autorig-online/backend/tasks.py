@@ -13,8 +13,9 @@ from typing import Optional, Tuple, List, Dict, Any
 from urllib.parse import parse_qs, quote, urlparse
 import httpx
 
-from sqlalchemy import select, desc, update
+from sqlalchemy import select, desc, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
 
 from database import Task, User, AnonSession, AsyncSessionLocal
 from config import APP_URL
@@ -411,6 +412,40 @@ def find_file_by_pattern(ready_urls: List[str], pattern: str, quality: str = "10
     return None
 
 
+# Longest suffix first so ".hdrp.unitypackage" wins over ".unitypackage".
+QUICK_DOWNLOAD_SUFFIXES: Tuple[Tuple[str, str], ...] = (
+    (".hdrp.unitypackage", "unity_hdrp"),
+    (".unitypackage", "unity"),
+    (".html", "viewer_html"),
+    (".c4d", "cinema4d"),
+    (".max", "max"),
+    (".fbx", "unreal"),
+    (".ma", "maya"),
+)
+
+
+def find_quick_download_files(ready_urls: List[str], quality: str = "100k") -> Dict[str, str]:
+    """
+    Single pass over ready_urls: first URL per QUICK_DOWNLOAD_SUFFIXES key in the
+    requested quality folder, falling back to 10k/1k like find_file_by_pattern.
+    """
+    folders = [f"_{quality}/"]
+    if quality == "100k":
+        folders += ["_10k/", "_1k/"]
+    best: Dict[str, Tuple[int, str]] = {}
+    for url in ready_urls or ():
+        u = (url or "").lower()
+        rank = next((i for i, folder in enumerate(folders) if folder in u), None)
+        if rank is None:
+            continue
+        for suffix, key in QUICK_DOWNLOAD_SUFFIXES:
+            if u.endswith(suffix):
+                if key not in best or rank < best[key][0]:
+                    best[key] = (rank, url)
+                break
+    return {key: url for key, (_, url) in best.items()}
+
+
 def resolve_prepared_glb_source_url(task: Task) -> Optional[str]:
     """
     Best URL for Auto Convert input: rigged prepared GLB (same sources as /api/task/.../prepared.glb).
@@ -1076,6 +1111,10 @@ async def persist_validated_worker_viewer_artifacts(task: Task, result: Any) ->
         task.viewer_prepared_glb_url = prepared
     if animations:
         task.viewer_animations_glb_url = animations
+    if prepared or animations:
+        from main import invalidate_viewer_html_cache
+
+        await invalidate_viewer_html_cache(task.id)
 
 
 async def reconcile_task_viewer_artifacts(
@@ -1145,6 +1184,9 @@ async def reconcile_task_viewer_artifacts(
             return task
         await db.commit()
         await db.refresh(task)
+        from main import invalidate_viewer_html_cache
+
+        await invalidate_viewer_html_cache(task.id)
     return task
 
 async def _fetch_worker_failure_message(task: Task) -> Optional[str]:
@@ -1243,10 +1285,15 @@ AUTO_FULL_CONVERT_OWNERS = {
 }
 
 
-async def update_task_progress(db: AsyncSession, task: Task) -> Task:
+async def update_task_progress(
+    db: AsyncSession,
+    task: Task,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Task:
     """
     Check and update task progress.
     Checks a batch of URLs and updates ready count.
+    `client` is reused for the URL availability probes when given.
     """
     if _restore_worker_api_from_progress_page(task):
         task.updated_at = datetime.utcnow()
@@ -1280,7 +1327,8 @@ async def update_task_progress(db: AsyncSession, task: Task) -> Task:
     if task.status not in ("done", "error") and task.output_urls:
         newly_ready, total_ready = await check_urls_batch(
             task.output_urls, 
-            already_ready
+            already_ready,
+            client=client,
         )
         
         # Update task
@@ -1822,6 +1870,23 @@ async def get_task_by_id(db: AsyncSession, task_id: str) -> Optional[Task]:
     return result.scalar_one_or_none()
 
 
+async def get_task_gate_row(db: AsyncSession, task_id: str):
+    """
+    Only the columns retry/restart gates check (owner, status, age, input).
+    Those requests are mostly rejected, so the full Task is loaded only once they pass.
+    """
+    result = await db.execute(
+        select(
+            Task.owner_type,
+            Task.owner_id,
+            Task.status,
+            Task.created_at,
+            Task.input_url,
+        ).where(Task.id == task_id)
+    )
+    return result.first()
+
+
 async def get_user_tasks(
     db: AsyncSession,
     owner_type: str,
@@ -1833,30 +1898,65 @@ async def get_user_tasks(
     Get tasks for a user/anon with pagination.
     Returns: (tasks, total_count)
     """
-    # Count total
-    count_result = await db.execute(
-        select(Task).where(
-            Task.owner_type == owner_type,
-            Task.owner_id == owner_id
-        )
+    conditions = (
+        Task.owner_type == owner_type,
+        Task.owner_id == owner_id
     )
-    total = len(count_result.scalars().all())
-    
-    # Get paginated
-    offset = (page - 1) * per_page
+    return await _paginate_tasks_with_total(
+        db, conditions, offset=(page - 1) * per_page, limit=per_page
+    )
+
+
+async def get_user_tasks_by_user_id(
+    db: AsyncSession,
+    user_id: int,
+    page: int = 1,
+    per_page: int = 20
+) -> Optional[Tuple[list, int]]:
+    """
+    Tasks of a registered user addressed by User.id, without loading the User first.
+    Returns None when the user does not exist.
+    """
+    owner_email = select(User.email).where(User.id == user_id).scalar_subquery()
+    conditions = (
+        Task.owner_type == "user",
+        Task.owner_id == owner_email
+    )
+    tasks, total = await _paginate_tasks_with_total(
+        db, conditions, offset=(page - 1) * per_page, limit=per_page
+    )
+    if total == 0:
+        # No rows cannot tell "no tasks" from "no such user"; only then check the user.
+        exists = await db.execute(select(User.id).where(User.id == user_id))
+        if exists.first() is None:
+            return None
+    return tasks, total
+
+
+async def _paginate_tasks_with_total(
+    db: AsyncSession,
+    conditions: tuple,
+    offset: int,
+    limit: int,
+) -> Tuple[list, int]:
+    """
+    One round trip for a page of tasks plus the total via COUNT(*) OVER ().
+    Only a page past the end (no rows to carry the window total) needs a separate COUNT.
+    """
     result = await db.execute(
-        select(Task)
-        .where(
-            Task.owner_type == owner_type,
-            Task.owner_id == owner_id
-        )
+        select(Task, func.count().over().label("total"))
+        .where(*conditions)
         .order_by(desc(Task.created_at))
         .offset(offset)
-        .limit(per_page)
+        .limit(limit)
     )
-    tasks = result.scalars().all()
-    
-    return list(tasks), total
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], int(rows[0].total)
+    if offset <= 0:
+        return [], 0
+    count_result = await db.execute(select(func.count(Task.id)).where(*conditions))
+    return [], count_result.scalar() or 0
 
 
 # =============================================================================
@@ -1874,14 +1974,23 @@ async def get_all_users(
     Get all users with search and pagination (admin).
     Returns: (users, total_count)
     """
-    query = select(User)
+    # Only the AdminUserListItem columns; raiseload guards against lazy loads under AsyncSession.
+    query = select(User).options(
+        load_only(
+            User.id, User.email, User.name, User.balance_credits,
+            User.total_tasks, User.created_at, User.last_login_at,
+        ),
+        raiseload("*"),
+    )
+    count_query = select(func.count(User.id))
     
     if search:
         query = query.where(User.email.ilike(f"%{search}%"))
+        count_query = count_query.where(User.email.ilike(f"%{search}%"))
     
     # Count total
-    count_result = await db.execute(query)
-    total = len(count_result.scalars().all())
+    count_result = await db.execute(count_query)
+    total = count_result.scalar() or 0
     
     # Sort
     sort_column = getattr(User, sort_by, User.created_at)
@@ -1951,28 +2060,14 @@ async def get_gallery_items(
     Get completed tasks with videos for public gallery.
     Returns: (tasks, total_count)
     """
-    from sqlalchemy import func
-
     base = (
         Task.status == "done",
         Task.video_ready == True,
         _gallery_task_has_poster_sql(),
     )
-
-    count_result = await db.execute(select(func.count(Task.id)).where(*base))
-    total = count_result.scalar() or 0
-
-    offset = (page - 1) * per_page
-    result = await db.execute(
-        select(Task)
-        .where(*base)
-        .order_by(desc(Task.created_at))
-        .offset(offset)
-        .limit(per_page)
+    return await _paginate_tasks_with_total(
+        db, base, offset=(page - 1) * per_page, limit=per_page
     )
-    tasks = result.scalars().all()
-
-    return list(tasks), total
 
 
 def format_time_ago(dt: datetime) -> str:
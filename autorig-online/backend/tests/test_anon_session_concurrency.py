@@ -1,12 +1,13 @@
 import asyncio
 import tempfile
 import unittest
+from datetime import datetime, timedelta
 from pathlib import Path
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
-from auth import get_or_create_anon_session
+from auth import ANON_LAST_SEEN_WRITE_INTERVAL, get_or_create_anon_session
 from database import AnonSession, Base
 
 
@@ -50,6 +51,27 @@ class AnonymousSessionConcurrencyTests(unittest.IsolatedAsyncioTestCase):
             )
         self.assertEqual(count, 1)
 
+    async def test_last_seen_is_only_rewritten_after_the_write_interval(self):
+        anon_id = "throttled-anonymous-session"
+        async with self.session_factory() as session:
+            created = await get_or_create_anon_session(session, anon_id, is_new=True)
+            first_seen = created.last_seen_at
+
+        async with self.session_factory() as session:
+            again = await get_or_create_anon_session(session, anon_id)
+            self.assertEqual(again.last_seen_at, first_seen)
+            self.assertFalse(session.dirty)
+
+        stale = datetime.utcnow() - ANON_LAST_SEEN_WRITE_INTERVAL - timedelta(seconds=1)
+        async with self.session_factory() as session:
+            row = await session.get(AnonSession, anon_id)
+            row.last_seen_at = stale
+            await session.commit()
+
+        async with self.session_factory() as session:
+            refreshed = await get_or_create_anon_session(session, anon_id)
+            self.assertGreater(refreshed.last_seen_at, stale)
+
 
 if __name__ == "__main__":
     unittest.main()
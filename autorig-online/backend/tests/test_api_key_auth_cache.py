@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import main
+from database import ApiKey, User
+
+
+def _request(api_key):
+    return SimpleNamespace(headers={"x-api-key": api_key}, state=SimpleNamespace())
+
+
+class ApiKeyAuthCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(self.temp_dir.name) / "api-keys.db"
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with self.engine.begin() as connection:
+            for table in (ApiKey.__table__, User.__table__):
+                await connection.run_sync(
+                    lambda sync_connection, table=table: table.create(
+                        sync_connection,
+                        checkfirst=True,
+                    )
+                )
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.api_key, prefix, key_hash = main._make_api_key()
+        async with self.session_factory() as session:
+            session.add(User(id=7, email="owner@example.com"))
+            session.add(ApiKey(id=1, user_id=7, key_prefix=prefix, key_hash=key_hash))
+            await session.commit()
+        main._api_key_auth_cache.clear()
+        main._active_api_key_prefixes = None
+        self.addCleanup(main._api_key_auth_cache.clear)
+
+    async def asyncTearDown(self):
+        main._active_api_key_prefixes = None
+        await self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    async def resolve(self):
+        async with self.session_factory() as session:
+            return await main.resolve_api_key_identity(_request(self.api_key), session)
+
+    async def test_verified_key_is_reused_from_cache(self):
+        user, anon_id = await self.resolve()
+        self.assertEqual((user.id, anon_id), (7, None))
+        async with self.session_factory() as session:
+            # Hide the key row: a cache hit must not need it.
+            await session.execute(update(ApiKey).values(key_hash="0" * 64))
+            await session.commit()
+
+        user, _ = await self.resolve()
+        self.assertEqual(user.id, 7)
+
+    async def test_last_used_at_is_buffered_until_flush(self):
+        main._pending_api_key_last_used.clear()
+        self.addCleanup(main._pending_api_key_last_used.clear)
+        await self.resolve()
+        await self.resolve()
+        async with self.session_factory() as session:
+            self.assertIsNone((await session.execute(select(ApiKey.last_used_at))).scalar_one())
+            self.assertEqual(await main.flush_api_key_last_used(session), 1)
+            self.assertEqual(await main.flush_api_key_last_used(session), 0)
+        async with self.session_factory() as session:
+            self.assertIsNotNone((await session.execute(select(ApiKey.last_used_at))).scalar_one())
+
+    async def test_failed_flush_keeps_pending_uses(self):
+        main._pending_api_key_last_used.clear()
+        self.addCleanup(main._pending_api_key_last_used.clear)
+        await self.resolve()
+        async with self.session_factory() as session:
+            with patch.object(session, "commit", side_effect=RuntimeError("disk full")):
+                with self.assertRaises(RuntimeError):
+                    await main.flush_api_key_last_used(session)
+            await session.rollback()
+            self.assertIn(1, main._pending_api_key_last_used)
+            self.assertEqual(await main.flush_api_key_last_used(session), 1)
+        self.assertEqual(main._pending_api_key_last_used, {})
+
+    async def test_forgotten_key_is_verified_again(self):
+        await self.resolve()
+        async with self.session_factory() as session:
+            await session.execute(update(ApiKey).values(revoked_at=main.datetime.utcnow()))
+            await session.commit()
+        main._forget_cached_api_keys(key_id=1)
+
+        self.assertEqual(await self.resolve(), (None, None))
+
+    async def test_prefix_containing_underscore_is_accepted(self):
+        secret = "ab_cd_ef" + "x" * 35
+        self.api_key = f"ar_{secret[:8]}_{secret}"
+        async with self.session_factory() as session:
+            await session.execute(
+                update(ApiKey).values(
+                    key_prefix=secret[:8],
+                    key_hash=main.hashlib.sha256(self.api_key.encode("ascii")).hexdigest(),
+                )
+            )
+            await session.commit()
+
+        user, _ = await self.resolve()
+        self.assertEqual(user.id, 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
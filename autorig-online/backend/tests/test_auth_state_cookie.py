@@ -0,0 +1,29 @@
+import unittest
+
+import main
+
+
+class AuthStateCookieTests(unittest.TestCase):
+    def test_signed_cookie_round_trips(self):
+        state = "3f1c2a0e-8b9d-4c55-a1e2-0f6e7d8c9b10"
+        cookie = f"{state}.{main._auth_state_mac(state)}"
+
+        self.assertTrue(main._verify_auth_state(state, cookie))
+
+    def test_rejects_missing_or_mismatched_state(self):
+        state = "3f1c2a0e-8b9d-4c55-a1e2-0f6e7d8c9b10"
+        cookie = f"{state}.{main._auth_state_mac(state)}"
+
+        self.assertFalse(main._verify_auth_state(None, cookie))
+        self.assertFalse(main._verify_auth_state(state, None))
+        self.assertFalse(main._verify_auth_state("other-state", cookie))
+
+    def test_rejects_forged_signature(self):
+        state = "3f1c2a0e-8b9d-4c55-a1e2-0f6e7d8c9b10"
+
+        self.assertFalse(main._verify_auth_state(state, f"{state}.{'0' * 32}"))
+        self.assertFalse(main._verify_auth_state(state, state))
+
+
+if __name__ == "__main__":
+    unittest.main()
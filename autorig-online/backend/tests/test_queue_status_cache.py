@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import main
+
+
+class QueueStatusCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        main._queue_status_cache.update({"at": 0.0, "value": None, "inflight": None})
+
+    async def test_concurrent_pollers_share_one_worker_fan_out(self):
+        calls = 0
+
+        async def fake_status(db=None):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "status"
+
+        with patch.object(main, "get_global_queue_status", fake_status):
+            results = await asyncio.gather(*(main._cached_global_queue_status() for _ in range(8)))
+            again = await main._cached_global_queue_status()
+
+        self.assertEqual(results, ["status"] * 8)
+        self.assertEqual(again, "status")
+        self.assertEqual(calls, 1)
+
+    async def test_failed_fetch_is_not_cached(self):
+        async def failing_status(db=None):
+            raise RuntimeError("workers down")
+
+        with patch.object(main, "get_global_queue_status", failing_status):
+            with self.assertRaises(RuntimeError):
+                await main._cached_global_queue_status()
+
+        self.assertIsNone(main._queue_status_cache["value"])
+        self.assertIsNone(main._queue_status_cache["inflight"])
+
+
+if __name__ == "__main__":
+    unittest.main()
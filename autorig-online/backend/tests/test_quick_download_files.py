@@ -0,0 +1,45 @@
+"""Regression tests for the single-pass quick download lookup."""
+
+import unittest
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from tasks import find_quick_download_files
+
+
+class QuickDownloadFilesTests(unittest.TestCase):
+    def test_dispatches_by_suffix_and_prefers_100k(self):
+        base = "https://w1.example/converter/glb/abc"
+        urls = [
+            f"{base}/abc_10k/abc.max",
+            f"{base}/abc_100k/abc.hdrp.unitypackage",
+            f"{base}/abc_100k/abc.unitypackage",
+            f"{base}/abc_100k/abc.max",
+            f"{base}/abc_100k/abc.ma",
+            f"{base}/abc_100k/abc.html",
+            f"{base}/abc_1k/abc.fbx",
+            f"{base}/abc.c4d",
+        ]
+        self.assertEqual(
+            find_quick_download_files(urls),
+            {
+                "max": f"{base}/abc_100k/abc.max",
+                "maya": f"{base}/abc_100k/abc.ma",
+                "unity_hdrp": f"{base}/abc_100k/abc.hdrp.unitypackage",
+                "unity": f"{base}/abc_100k/abc.unitypackage",
+                "viewer_html": f"{base}/abc_100k/abc.html",
+                "unreal": f"{base}/abc_1k/abc.fbx",
+            },
+        )
+
+    def test_empty_ready_urls(self):
+        self.assertEqual(find_quick_download_files([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from collections import Counter
+
+from starlette.routing import Route
+
+import main
+
+
+class RouteRegistrationTests(unittest.TestCase):
+    def test_each_path_and_method_is_registered_once(self):
+        registrations = Counter(
+            (route.path, method)
+            for route in main.app.routes
+            if isinstance(route, Route)
+            for method in (route.methods or ())
+        )
+        duplicates = sorted(key for key, count in registrations.items() if count > 1)
+        self.assertEqual(duplicates, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import auth
+from database import Session, User
+
+
+class SessionUserCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(self.temp_dir.name) / "sessions.db"
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with self.engine.begin() as connection:
+            for table in (Session.__table__, User.__table__):
+                await connection.run_sync(
+                    lambda sync_connection, table=table: table.create(
+                        sync_connection,
+                        checkfirst=True,
+                    )
+                )
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.session_factory() as db:
+            db.add(User(id=7, email="owner@example.com"))
+            db.add(Session(token="tok", user_id=7, expires_at=datetime.utcnow() + timedelta(days=1)))
+            db.add(Session(token="old", user_id=7, expires_at=datetime.utcnow() - timedelta(days=1)))
+            await db.commit()
+        auth._session_user_cache.clear()
+        self.addCleanup(auth._session_user_cache.clear)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    async def lookup(self, token):
+        async with self.session_factory() as db:
+            return await auth.get_user_by_session(db, token)
+
+    async def test_cached_session_resolves_without_session_row(self):
+        self.assertEqual((await self.lookup("tok")).id, 7)
+        async with self.session_factory() as db:
+            await db.execute(delete(Session))
+            await db.commit()
+        self.assertEqual((await self.lookup("tok")).id, 7)
+
+    async def test_expired_and_logged_out_sessions_resolve_to_none(self):
+        self.assertIsNone(await self.lookup("old"))
+        await self.lookup("tok")
+        async with self.session_factory() as db:
+            await auth.delete_session(db, "tok")
+        self.assertIsNone(await self.lookup("tok"))
+
+
+if __name__ == "__main__":
+    unittest.main()
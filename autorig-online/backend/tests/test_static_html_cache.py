@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import main
+
+
+class StaticHtmlCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.page = os.path.join(tmp.name, "page.html")
+        with open(self.page, "w", encoding="utf-8") as f:
+            f.write("<html><body>v1</body></html>")
+        for target, value in (
+            ("_STATIC_DIR_STR", tmp.name),
+            ("_STATIC_PARTIAL_PATHS", ()),
+            ("_STATIC_HTML_CACHE", {}),
+            ("_STATIC_HTML_CHECKED_AT", {}),
+            ("_STATIC_TEXT_CACHE", {}),
+        ):
+            p = patch.object(main, target, value)
+            p.start()
+            self.addCleanup(p.stop)
+
+    def rewrite_page(self, text):
+        with open(self.page, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.utime(self.page, ns=(1, 1))
+
+    def test_page_is_not_restated_within_recheck_window(self):
+        first = main._static_html_response("page.html")
+        self.rewrite_page("<html><body>v2!</body></html>")
+        with patch.object(main, "_static_file_signature") as signature:
+            second = main._static_html_response("page.html")
+        signature.assert_not_called()
+        self.assertEqual(second.body, first.body)
+
+    def test_changed_page_is_picked_up_after_recheck_window(self):
+        main._static_html_response("page.html")
+        self.rewrite_page("<html><body>v2!</body></html>")
+        with patch.object(main, "STATIC_HTML_RECHECK_SECONDS", 0.0):
+            response = main._static_html_response("page.html")
+        self.assertIn(b"v2!", response.body)
+
+
+if __name__ == "__main__":
+    unittest.main()
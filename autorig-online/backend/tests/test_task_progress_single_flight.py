@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import main
+
+
+class TaskProgressSingleFlightTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        main._task_progress_inflight.clear()
+
+    async def test_concurrent_polls_share_one_worker_refresh(self):
+        calls = 0
+
+        async def fake_update(db, task):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return task
+
+        sessions = [SimpleNamespace(refresh=AsyncMock()) for _ in range(4)]
+        with patch.object(main, "update_task_progress", fake_update):
+            await asyncio.gather(
+                *(
+                    main._update_task_progress_single_flight(db, SimpleNamespace(id="task-1"))
+                    for db in sessions
+                )
+            )
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(sum(db.refresh.await_count for db in sessions), 3)
+        self.assertEqual(main._task_progress_inflight, {})
+
+    async def test_followers_are_released_when_the_leader_fails(self):
+        async def failing_update(db, task):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("worker down")
+
+        leader_db = SimpleNamespace(refresh=AsyncMock())
+        follower_db = SimpleNamespace(refresh=AsyncMock())
+        with patch.object(main, "update_task_progress", failing_update):
+            results = await asyncio.gather(
+                main._update_task_progress_single_flight(leader_db, SimpleNamespace(id="task-2")),
+                main._update_task_progress_single_flight(follower_db, SimpleNamespace(id="task-2")),
+                return_exceptions=True,
+            )
+
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual(results[1].id, "task-2")
+        follower_db.refresh.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
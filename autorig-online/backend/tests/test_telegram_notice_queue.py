@@ -0,0 +1,44 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import main
+
+
+class TelegramNoticeQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncTearDown(self):
+        await main._stop_telegram_notice_workers()
+
+    async def test_notice_is_delivered_by_worker(self):
+        send = AsyncMock()
+
+        main._enqueue_telegram_notice(send, sale_id="s1", credits=5)
+        await asyncio.sleep(0)
+
+        send.assert_awaited_once_with(sale_id="s1", credits=5)
+
+    async def test_failing_notice_does_not_stop_the_worker(self):
+        failing = AsyncMock(side_effect=RuntimeError("telegram down"))
+        send = AsyncMock()
+
+        main._enqueue_telegram_notice(failing)
+        main._enqueue_telegram_notice(send, sale_id="s2")
+        await asyncio.wait_for(main._telegram_notice_queue().join(), timeout=1)
+
+        failing.assert_awaited_once()
+        send.assert_awaited_once_with(sale_id="s2")
+
+    async def test_full_queue_drops_notice(self):
+        send = AsyncMock()
+        with patch.object(main, "TELEGRAM_NOTICE_QUEUE_MAX", 1), patch.object(main, "TELEGRAM_NOTICE_WORKERS", 0):
+            main._enqueue_telegram_notice(send, sale_id="kept")
+            main._enqueue_telegram_notice(send, sale_id="dropped")
+
+            queue = main._telegram_notice_queue()
+            self.assertEqual(queue.qsize(), 1)
+            self.assertEqual(queue.get_nowait()[1], {"sale_id": "kept"})
+            queue.task_done()
+
+
+if __name__ == "__main__":
+    unittest.main()
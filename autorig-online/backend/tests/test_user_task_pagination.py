@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import Task, User
+from tasks import get_user_tasks, get_user_tasks_by_user_id
+
+
+class UserTaskPaginationTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        db_path = Path(self.temp_dir.name) / "task-pages.db"
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with self.engine.begin() as connection:
+            for table in (Task.__table__, User.__table__):
+                await connection.run_sync(
+                    lambda sync_connection, table=table: table.create(
+                        sync_connection,
+                        checkfirst=True,
+                    )
+                )
+        self.session_factory = async_sessionmaker(
+            self.engine,
+            expire_on_commit=False,
+        )
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            for i in range(5):
+                session.add(
+                    Task(
+                        id=f"task-{i}",
+                        owner_type="user",
+                        owner_id="owner@example.com",
+                        status="done",
+                        created_at=now - timedelta(minutes=i),
+                    )
+                )
+            session.add(User(id=7, email="owner@example.com"))
+            session.add(User(id=8, email="idle@example.com"))
+            session.add(
+                Task(id="other", owner_type="user", owner_id="other@example.com", status="done")
+            )
+            await session.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+        self.temp_dir.cleanup()
+
+    async def test_page_carries_owner_total(self):
+        async with self.session_factory() as session:
+            tasks, total = await get_user_tasks(session, "user", "owner@example.com", page=2, per_page=2)
+        self.assertEqual([t.id for t in tasks], ["task-2", "task-3"])
+        self.assertEqual(total, 5)
+
+    async def test_page_past_the_end_still_reports_total(self):
+        async with self.session_factory() as session:
+            tasks, total = await get_user_tasks(session, "user", "owner@example.com", page=9, per_page=2)
+            empty, none_total = await get_user_tasks(session, "anon", "nobody", page=1, per_page=2)
+        self.assertEqual((tasks, total), ([], 5))
+        self.assertEqual((empty, none_total), ([], 0))
+
+    async def test_tasks_by_user_id_distinguishes_missing_user(self):
+        async with self.session_factory() as session:
+            tasks, total = await get_user_tasks_by_user_id(session, 7, page=1, per_page=2)
+            idle = await get_user_tasks_by_user_id(session, 8)
+            missing = await get_user_tasks_by_user_id(session, 99)
+        self.assertEqual(([t.id for t in tasks], total), (["task-0", "task-1"], 5))
+        self.assertEqual(idle, ([], 0))
+        self.assertIsNone(missing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -88,6 +88,7 @@ class ViewerArtifactHardeningTests(unittest.IsolatedAsyncioTestCase):
 
     async def test_dispatch_persists_only_validated_viewer_url(self):
         task = SimpleNamespace(
+            id="viewer-task",
             viewer_prepared_glb_url=None,
             viewer_animations_glb_url=None,
         )
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import main
+
+
+PREFIX = "/api/task/t1/viewer-resource?path="
+
+
+class ViewerHtmlRewriteTests(unittest.TestCase):
+    def rewrite(self, html_content):
+        return main._rewrite_viewer_html(html_content, "t1", "abc-123")
+
+    def test_absolute_relative_and_bare_paths_share_one_pass(self):
+        html_content = (
+            '<script src="/converter/glb/abc-123/abc-123_100k/viewer.js"></script>'
+            '<img src="./tex.png">'
+            "<a href='../data/scene.json?v=1'>"
+            "var m = 'model.mview';"
+        )
+        self.assertEqual(
+            self.rewrite(html_content),
+            f'<script src="{PREFIX}/converter/glb/abc-123/abc-123_100k/viewer.js"></script>'
+            f'<img src="{PREFIX}/converter/glb/abc-123/abc-123_100k/tex.png">'
+            f"<a href='{PREFIX}/converter/glb/abc-123/abc-123_100k/data/scene.json%3Fv%3D1'>"
+            f"var m = '{PREFIX}/converter/glb/abc-123/abc-123_100k/model.mview';",
+        )
+
+    def test_unquoted_script_path_is_quoted(self):
+        self.assertEqual(
+            self.rewrite("load: /converter/glb/abc-123/raw.mview)"),
+            f'load="{PREFIX}/converter/glb/abc-123/raw.mview")',
+        )
+
+    def test_rewrite_is_idempotent(self):
+        once = self.rewrite('"/converter/glb/abc-123/a.mview" "./b.png" "c.json"')
+        self.assertEqual(self.rewrite(once), once)
+
+    def test_streamed_rewrite_matches_whole_page_at_every_split(self):
+        html_content = (
+            '<script src="/converter/glb/abc-123/abc-123_100k/viewer.js"></script>'
+            "<img src='./tex.png'> load: /converter/glb/abc-123/raw.mview) "
+            '"model.mview" "plain text"'
+        )
+        expected = self.rewrite(html_content)
+
+        async def collect(chunks):
+            async def source():
+                for chunk in chunks:
+                    yield chunk
+            parts = []
+            async for part in main._iter_rewritten_viewer_html(source(), "t1", "abc-123"):
+                parts.append(part)
+            return "".join(parts)
+
+        for split in range(len(html_content) + 1):
+            chunks = [html_content[:split], html_content[split:]]
+            self.assertEqual(asyncio.run(collect(chunks)), expected, split)
+        self.assertEqual(asyncio.run(collect(list(html_content))), expected)
+        with patch.object(main, "VIEWER_REWRITE_THREAD_MIN_CHARS", 0):
+            self.assertEqual(asyncio.run(collect([html_content[:40], html_content[40:]])), expected)
+
+
+class ViewerHtmlCacheTests(unittest.TestCase):
+    def setUp(self):
+        main._viewer_html_cache.clear()
+        self.addCleanup(main._viewer_html_cache.clear)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        cache_dir_patch = patch.object(main, "TASK_CACHE_DIR", Path(tmp.name))
+        cache_dir_patch.start()
+        self.addCleanup(cache_dir_patch.stop)
+
+    def test_completed_stream_is_cached_with_etag(self):
+        key = ("t1", "http://worker/converter/glb/abc-123/v.html", "abc-123")
+
+        async def drain():
+            async def source():
+                yield "<html>"
+                yield "</html>"
+            return [part async for part in main._iter_and_cache_viewer_html(source(), key)]
+
+        self.assertEqual(asyncio.run(drain()), ["<html>", "</html>"])
+        etag, body = main._viewer_html_cache_get(key)
+        self.assertEqual(body, b"<html></html>")
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+
+        body, remaining = main._read_cached_viewer_html(key)
+        self.assertEqual(body, b"<html></html>")
+        self.assertLessEqual(remaining, main.VIEWER_HTML_CACHE_TTL_SECONDS)
+
+        asyncio.run(main.invalidate_viewer_html_cache("t1"))
+        self.assertIsNone(main._viewer_html_cache_get(key))
+        self.assertIsNone(main._read_cached_viewer_html(key))
+
+    def test_expired_disk_copy_is_a_miss(self):
+        key = ("t1", "http://worker/converter/glb/abc-123/v.html", "abc-123")
+        main._write_cached_viewer_html(key, b"<html></html>")
+        path = main._viewer_html_disk_path(key)
+        stale = time.time() - main.VIEWER_HTML_CACHE_TTL_SECONDS - 1
+        os.utime(path, (stale, stale))
+
+        self.assertIsNone(main._read_cached_viewer_html(key))
+        self.assertFalse(path.exists())
+
+    def test_meta_files_do_not_count_as_task_cache(self):
+        key = ("t1", "http://worker/converter/glb/abc-123/v.html", "abc-123")
+        main._write_cached_viewer_html(key, b"<html></html>")
+        self.assertIsNone(main._task_cache_dir_size_bytes("t1"))
+
+        (main.TASK_CACHE_DIR / "t1" / "model.glb").write_bytes(b"glb")
+        self.assertEqual(main._task_cache_dir_size_bytes("t1"), 3)
+
+    def test_least_recently_used_page_is_evicted(self):
+        with patch.object(main, "VIEWER_HTML_CACHE_MAX", 2):
+            main._viewer_html_cache_put(("a", "u", "g"), b"a")
+            main._viewer_html_cache_put(("b", "u", "g"), b"b")
+            main._viewer_html_cache_get(("a", "u", "g"))
+            main._viewer_html_cache_put(("c", "u", "g"), b"c")
+        self.assertIsNotNone(main._viewer_html_cache_get(("a", "u", "g")))
+        self.assertIsNone(main._viewer_html_cache_get(("b", "u", "g")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+import main
+
+
+class WorkerPollCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        main._worker_poll_cache.clear()
+        main._worker_poll_inflight.clear()
+        self.addCleanup(main._worker_poll_cache.clear)
+
+    async def test_concurrent_polls_share_one_worker_fetch(self):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 200, "step 1\nstep 2"
+
+        results = await asyncio.gather(*(main._cached_worker_poll("log", fetch) for _ in range(6)))
+        again = await main._cached_worker_poll("log", fetch)
+
+        self.assertEqual(results, [(200, "step 1\nstep 2")] * 6)
+        self.assertEqual(again, (200, "step 1\nstep 2"))
+        self.assertEqual(calls, 1)
+
+    async def test_expired_entry_is_fetched_again(self):
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        with patch.object(main, "WORKER_POLL_CACHE_TTL_SECONDS", 0.0):
+            self.assertEqual(await main._cached_worker_poll("files", fetch), 1)
+            self.assertEqual(await main._cached_worker_poll("files", fetch), 2)
+
+    async def test_expired_entries_are_pruned_on_store(self):
+        async def fetch():
+            return "body"
+
+        with patch.object(main, "WORKER_POLL_CACHE_TTL_SECONDS", 0.0):
+            await main._cached_worker_poll("finished-task", fetch)
+        await main._cached_worker_poll("running-task", fetch)
+
+        self.assertEqual(list(main._worker_poll_cache), ["running-task"])
+
+    async def test_failed_fetch_is_not_cached(self):
+        async def failing():
+            raise RuntimeError("worker down")
+
+        with self.assertRaises(RuntimeError):
+            await main._cached_worker_poll("log", failing)
+
+        self.assertNotIn("log", main._worker_poll_cache)
+        self.assertNotIn("log", main._worker_poll_inflight)
+
+
+
+class ProgressLogConditionalGetTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._reset_progress_log_cache()
+        self.addCleanup(self._reset_progress_log_cache)
+
+    @staticmethod
+    def _reset_progress_log_cache():
+        main._progress_log_validators.clear()
+        main._progress_log_cached_bytes = 0
+
+    async def test_unchanged_log_is_served_from_the_last_body(self):
+        seen_headers = []
+        responses = [
+            httpx.Response(200, text="line 1\n", headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+
+        class FakeClient:
+            async def get(self, url, timeout=None, headers=None):
+                seen_headers.append(dict(headers or {}))
+                return responses.pop(0)
+
+        with patch.object(main, "_proxy_http_client", return_value=FakeClient()):
+            first = await main._fetch_worker_progress_log("http://w/log.txt")
+            second = await main._fetch_worker_progress_log("http://w/log.txt")
+
+        self.assertEqual(first, (200, "line 1\n"))
+        self.assertEqual(second, (200, "line 1\n"))
+        self.assertEqual(seen_headers, [{}, {"If-None-Match": '"v1"'}])
+
+    async def test_tail_poll_requests_a_range_and_drops_the_partial_line(self):
+        seen_headers = []
+
+        class FakeClient:
+            async def get(self, url, timeout=None, headers=None):
+                seen_headers.append(dict(headers or {}))
+                return httpx.Response(
+                    206,
+                    text="ial line\nstep 9\nstep 10\n",
+                    headers={"Content-Range": "bytes 100-123/124"},
+                )
+
+        with patch.object(main, "_proxy_http_client", return_value=FakeClient()):
+            result = await main._fetch_worker_progress_log_tail("http://w/log.txt")
+
+        self.assertEqual(result, (200, "step 9\nstep 10\n"))
+        self.assertEqual(seen_headers, [{"Range": f"bytes=-{main.PROGRESS_LOG_TAIL_BYTES}"}])
+
+    def test_kept_bodies_are_bounded_by_size(self):
+        with (
+            patch.object(main, "PROGRESS_LOG_CACHE_BODY_MAX_BYTES", 10),
+            patch.object(main, "PROGRESS_LOG_CACHE_TOTAL_MAX_BYTES", 16),
+        ):
+            main._remember_progress_log("big", '"b"', None, "x" * 11, 11)
+            main._remember_progress_log("a", '"a"', None, "a" * 8, 8)
+            main._remember_progress_log("b", '"b"', None, "b" * 8, 8)
+            main._remember_progress_log("c", '"c"', None, "c" * 8, 8)
+
+        self.assertEqual(list(main._progress_log_validators), ["b", "c"])
+        self.assertEqual(main._progress_log_cached_bytes, 16)
+
+    async def test_finished_task_log_is_not_kept(self):
+        main._remember_progress_log("http://w/log.txt", '"v1"', None, "old\n", 4)
+        seen_headers = []
+
+        class FakeClient:
+            async def get(self, url, timeout=None, headers=None):
+                seen_headers.append(dict(headers or {}))
+                return httpx.Response(200, text="done\n", headers={"ETag": '"v2"'})
+
+        with patch.object(main, "_proxy_http_client", return_value=FakeClient()):
+            result = await main._fetch_worker_progress_log("http://w/log.txt", keep=False)
+
+        self.assertEqual(result, (200, "done\n"))
+        self.assertEqual(seen_headers, [{}])
+        self.assertEqual(main._progress_log_validators, {})
+        self.assertEqual(main._progress_log_cached_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -631,14 +631,21 @@ async def check_url_availability(url: str, client: httpx.AsyncClient) -> bool:
 
 async def check_urls_batch(
     urls: List[str], 
-    already_ready: set = None
+    already_ready: set = None,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Tuple[List[str], int]:
     """
     Check availability of URLs in batches.
     Returns: (list of newly ready URLs, total ready count)
+
+    Pass a client to reuse its connections (e.g. one client per worker across
+    all of that worker's tasks); otherwise a short-lived client is opened.
     """
     if already_ready is None:
         already_ready = set()
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await check_urls_batch(urls, already_ready, client=own_client)
     
     # Filter out already confirmed ready URLs
     urls_to_check = [u for u in urls if u not in already_ready]
@@ -651,28 +658,27 @@ async def check_urls_batch(
     random.shuffle(urls_to_check)
     
     newly_ready = []
-    
-    async with httpx.AsyncClient() as client:
-        # Process in batches with concurrency limit
-        semaphore = asyncio.Semaphore(PROGRESS_CONCURRENCY)
-        
-        async def check_with_semaphore(url: str) -> Tuple[str, bool]:
-            async with semaphore:
-                is_ready = await check_url_availability(url, client)
-                return url, is_ready
-        
-        # Check batch
-        batch = urls_to_check[:PROGRESS_BATCH_SIZE]
-        tasks = [check_with_semaphore(url) for url in batch]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for result in results:
-            if isinstance(result, tuple):
-                url, is_ready = result
-                if is_ready:
-                    newly_ready.append(url)
-                    already_ready.add(url)
-    
+
+    # Process in batches with concurrency limit
+    semaphore = asyncio.Semaphore(PROGRESS_CONCURRENCY)
+
+    async def check_with_semaphore(url: str) -> Tuple[str, bool]:
+        async with semaphore:
+            is_ready = await check_url_availability(url, client)
+            return url, is_ready
+
+    # Check batch
+    batch = urls_to_check[:PROGRESS_BATCH_SIZE]
+    tasks = [check_with_semaphore(url) for url in batch]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, tuple):
+            url, is_ready = result
+            if is_ready:
+                newly_ready.append(url)
+                already_ready.add(url)
+
     return newly_ready, len(already_ready)
 
 